@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import messagebox, Toplevel, Listbox, Scrollbar
+from tkinter import messagebox, filedialog, Toplevel, Listbox, Scrollbar
 from tkinter import ttk
 import subprocess
 import threading
@@ -12,12 +12,42 @@ import platform
 import time
 import string
 import webbrowser
+import socket
+import stat
+import secrets
+import hmac
+import hashlib
+import csv
+import heapq
+import re
+import mmap
+import gc
+import multiprocessing
+import tempfile
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, OrderedDict, namedtuple
+from urllib.parse import urlsplit
 from subprocess import TimeoutExpired # Import TimeoutExpired specifically
 
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError: # Optional: without it, evicted vault records are fetched again from dcli instead of spilled to disk
+    AESGCM = None
+
 # --- Configuration and Logging Setup ---
 _CONFIG_FILE = 'config.ini'
 _LOG_FILE = 'dashlane_gui.log'
 _MAX_SEARCH_HISTORY = 10
+_SEARCH_HISTORY_IDLE_MS = 2000 # Typing pause after which the current search is recorded in the history
+_NOTE_SEARCH_DEBOUNCE_MS = 300 # note: searches rehydrate full records off the Tk loop, once typing pauses
+_QUERY_CACHE_SIZE = 64
+_MAX_DOMAIN_FACETS = 20
+_ITEM_CACHE_DEFAULT_MB = 256
+_INGEST_WORKER_MIN_BYTES = 512 * 1024 # Smaller payloads decode faster in-process than the round trip to the worker costs
+_DCLI_BULK_FETCH_THRESHOLD = 20 # Rehydrating more records than this uses one full listing instead of per-id lookups
+_DCLI_BROAD_FILTERS = list(string.ascii_lowercase) + list(string.digits) + ['æ', 'ø', 'å', 'é', 'à', 'ç']
+_QUERY_SOCKET_DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.dashlane_gui', 'query.sock')
 
 logging.basicConfig(level=logging.DEBUG,
                     format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s',
@@ -44,6 +74,1538 @@ DL_COLORS = {
 }
 
 
+# --- Vault Item Helpers ---
+def get_item_type(item):
+    """Classify a dcli item into the category shown in the Type column."""
+    if isinstance(item, CompactItem):
+        return item.item_type
+    if item.get('password'):
+        return "Login"
+    if item.get('note') is not None and item.get('note') != '': return "Secure Note"
+    elif any(key in item for key in ['firstName', 'lastName', 'birthDate', 'gender']): return "Personal Info"
+    elif any(key in item for key in ['address1', 'city', 'zipCode', 'country']): return "Address"
+    elif any(key in item for key in ['cardHolderName', 'cardNumber']): return "Credit Card"
+    elif any(key in item for key in ['licenseNumber', 'stateOfIssue']): return "ID"
+    elif item.get('website'): return "Website Only"
+    return "Other"
+
+
+def get_item_url(item):
+    """Return the website/url of an item, whichever field dcli populated."""
+    return item.get('url') or item.get('website') or ''
+
+
+def get_item_key(item):
+    """Identity of an item across loads: its dcli id, or (title, login, note) when it has none."""
+    return item.get('id') or (item.get('title', ''), item.get('login', ''), item.get('note', ''))
+
+
+_TWO_LEVEL_SUFFIXES = {'co', 'com', 'org', 'net', 'ac', 'gov', 'edu'}
+
+def get_item_domain(item):
+    """Registrable domain of the item's website, e.g. 'https://www.github.com/login' -> 'github.com'."""
+    url = get_item_url(item).strip().lower()
+    if not url:
+        return ''
+    host = urlsplit(url if '://' in url else f"//{url}").hostname or ''
+    labels = [label for label in host.split('.') if label]
+    if labels and labels[0] == 'www':
+        labels = labels[1:]
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _TWO_LEVEL_SUFFIXES:
+        return '.'.join(labels[-3:]) # e.g. bbc.co.uk
+    return '.'.join(labels[-2:])
+
+
+def get_item_field_text(item, field):
+    """Lower-cased text of a searchable field ('title', 'login', 'url', 'type' or 'note')."""
+    if field == 'url':
+        return get_item_url(item).lower()
+    if field == 'type':
+        return get_item_type(item).replace(' ', '').lower()
+    return (item.get(field) or '').lower()
+
+
+def public_item_fields(item):
+    """Metadata-only view of an item, safe to hand to other processes (no secrets)."""
+    return {
+        'id': item.get('id', ''),
+        'title': item.get('title', ''),
+        'login': item.get('login', ''),
+        'url': get_item_url(item),
+        'type': get_item_type(item)
+    }
+
+
+# --- Structured Query Language ---
+# Free text matches title, login or website. Field filters: title:, login:, url: (or website:),
+# type: (matched against the Type column, e.g. type:card, type:note), domain: (the exact registrable
+# domain of the website, as in the facet sidebar) and note:.
+# A leading '-' negates a term and "quoted phrases" keep their spaces. All terms must match.
+_QUERY_FIELD_ALIASES = {'title': 'title', 'login': 'login', 'url': 'url', 'website': 'url', 'type': 'type', 'domain': 'domain', 'note': 'note'}
+_FREE_TEXT_FIELDS = ('title', 'login', 'url')
+_QUERY_TOKEN_RE = re.compile(r'(-?)(?:([A-Za-z]+):)?(?:"([^"]*)"?|(\S*))')
+
+QueryTerm = namedtuple('QueryTerm', ['field', 'value', 'negated']) # field is None for free text
+
+
+class QueryPlan:
+    """A parsed search query: every term must match for an item to be included."""
+    def __init__(self, terms):
+        self.terms = terms
+        # A tuple, not a joined string: a quoted phrase such as "x :y" must not collide with the terms x and y
+        self.key = tuple(sorted((t.negated, t.field or '', t.value) for t in terms))
+
+    @staticmethod
+    def term_matches(term, item):
+        if term.field == 'domain':
+            return (get_item_domain(item) == term.value) != term.negated # Exact, unlike the substring fields
+        fields = _FREE_TEXT_FIELDS if term.field is None else (term.field,)
+        found = any(term.value in get_item_field_text(item, field) for field in fields)
+        return found != term.negated
+
+    def matches(self, item):
+        return all(self.term_matches(term, item) for term in self.terms)
+
+    def is_refinement_of(self, other):
+        """
+        True if every result of this plan is guaranteed to be a result of `other`, i.e. each term of
+        `other` is implied by one of ours. Lets the cache filter a previous result set instead of the vault.
+        """
+        for old_term in other.terms:
+            if not any(new_term.field == old_term.field and new_term.negated == old_term.negated
+                       and (new_term.value == old_term.value if old_term.negated or old_term.field == 'domain'
+                            else old_term.value in new_term.value)
+                       for new_term in self.terms):
+                return False
+        return True
+
+
+def parse_query(query):
+    """Parses a search string into a QueryPlan. Incomplete terms such as 'type:' or '-' are ignored."""
+    terms = []
+    for match in _QUERY_TOKEN_RE.finditer(query):
+        negated, field, quoted_value, bare_value = match.groups()
+        value = quoted_value if quoted_value is not None else bare_value
+        if field and field.lower() not in _QUERY_FIELD_ALIASES:
+            value = f"{field}:{value}" # e.g. a pasted 'https://...' is plain text, not a field filter
+            field = None
+        field = _QUERY_FIELD_ALIASES[field.lower()] if field else None
+        value = value.strip().lower()
+        if field == 'type':
+            value = value.replace(' ', '')
+        if value:
+            terms.append(QueryTerm(field, value, bool(negated)))
+    return QueryPlan(terms)
+
+
+def rank_item(item, plan):
+    """Relevance of a matching item: title prefix matches beat title matches, which beat login/website matches."""
+    title = (item.get('title') or '').lower()
+    score = 0
+    for term in plan.terms:
+        if term.negated or term.field not in (None, 'title'):
+            continue
+        if title.startswith(term.value):
+            score += 3
+        elif term.value in title:
+            score += 2
+        else:
+            score += 1
+    return score
+
+
+def merge_ranked_results(profile_results, plan):
+    """
+    Merges (profile_name, items) result lists from several profiles into one list of
+    (profile_name, item) pairs, best ranked first.
+    """
+    def sort_key(entry):
+        return (-rank_item(entry[1], plan), (entry[1].get('title') or '').lower())
+    ranked_lists = [sorted(((profile_name, item) for item in items), key=sort_key) for profile_name, items in profile_results]
+    return list(heapq.merge(*ranked_lists, key=sort_key))
+
+
+class VaultIndex:
+    """
+    Per-field trigram postings over the in-memory vault, plus exact indexes of item types and domains.
+    Built once per full load; a query starts from the most selective indexed terms and only
+    verifies the remaining terms on the surviving candidates.
+    """
+    INDEXED_FIELDS = _FREE_TEXT_FIELDS
+
+    def __init__(self, items, full_records=None):
+        self.items = items
+        self.full_records = full_records # full_records(items) -> full records, for note: terms on compact items
+        self.item_keys = []
+        self.item_types = [] # Type column value per position, for FacetCounts
+        self.item_domains = [] # Website domain ('' if none) per position, for FacetCounts
+        self.type_keys = []
+        self.type_postings = {}
+        self.domain_postings = {}
+        self.postings = {field: {} for field in self.INDEXED_FIELDS}
+
+        for position, item in enumerate(items):
+            item_type = get_item_type(item)
+            type_key = item_type.replace(' ', '').lower()
+            self.item_keys.append(get_item_key(item))
+            self.item_types.append(item_type)
+            domain = get_item_domain(item)
+            self.item_domains.append(domain)
+            self.domain_postings.setdefault(domain, []).append(position)
+            self.type_keys.append(type_key)
+            self.type_postings.setdefault(type_key, []).append(position)
+            for field in self.INDEXED_FIELDS:
+                text = get_item_field_text(item, field)
+                field_postings = self.postings[field]
+                for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+                    field_postings.setdefault(gram, []).append(position)
+        self.facet_totals = FacetCounts.count(self, range(len(items))) # Counts of the unfiltered vault
+
+    def _field_candidates(self, field, value):
+        """Positions whose field may contain value (a superset), or None if value is too short to index."""
+        if len(value) < 3:
+            return None
+        grams = sorted({value[i:i + 3] for i in range(len(value) - 2)},
+                       key=lambda gram: len(self.postings[field].get(gram, ())))
+        candidates = set(self.postings[field].get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(self.postings[field].get(gram, ()))
+        return candidates
+
+    def candidates(self, term):
+        """Candidate positions for a positive term, or None if the term cannot use the index."""
+        if term.field == 'type':
+            candidates = set()
+            for type_key, positions in self.type_postings.items():
+                if term.value in type_key:
+                    candidates.update(positions)
+            return candidates
+        if term.field == 'domain':
+            return set(self.domain_postings.get(term.value, ()))
+        if term.field not in self.INDEXED_FIELDS and term.field is not None:
+            return None
+        fields = _FREE_TEXT_FIELDS if term.field is None else (term.field,)
+        candidates = set()
+        for field in fields:
+            field_candidates = self._field_candidates(field, term.value)
+            if field_candidates is None:
+                return None
+            candidates.update(field_candidates)
+        return candidates
+
+    def _verify(self, position, terms):
+        item = self.items[position]
+        for term in terms:
+            if term.field == 'type':
+                if (term.value in self.type_keys[position]) == term.negated:
+                    return False
+            elif term.field == 'domain':
+                if (self.item_domains[position] == term.value) == term.negated:
+                    return False
+            elif not QueryPlan.term_matches(term, item):
+                return False
+        return True
+
+    def search(self, plan):
+        return [self.items[i] for i in self.search_positions(plan)]
+
+    def _verify_notes(self, positions, note_terms):
+        """Checks note: terms, which need the full records, on the positions that passed every other term."""
+        if not note_terms or not positions:
+            return positions
+        records = self.full_records([self.items[i] for i in positions]) if self.full_records else (self.items[i] for i in positions)
+        return [i for i, record in zip(positions, records) if all(QueryPlan.term_matches(term, record) for term in note_terms)]
+
+    def search_positions(self, plan, within=None):
+        """
+        Evaluates a plan to a list of positions: intersect indexed candidates smallest-first, then verify.
+        With `within` (positions of a result set this plan refines) only those positions are checked.
+        """
+        note_terms = [t for t in plan.terms if t.field == 'note']
+        if within is not None:
+            terms = sorted((t for t in plan.terms if t.field != 'note'), key=lambda t: t.negated)
+            return self._verify_notes([i for i in within if self._verify(i, terms)], note_terms)
+
+        candidate_sets = []
+        for term in plan.terms:
+            if not term.negated:
+                term_candidates = self.candidates(term)
+                if term_candidates is not None:
+                    candidate_sets.append(term_candidates)
+
+        if not candidate_sets:
+            positions = range(len(self.items))
+        else:
+            candidate_sets.sort(key=len)
+            narrowed = candidate_sets[0]
+            for term_candidates in candidate_sets[1:]:
+                if not narrowed:
+                    break
+                narrowed = narrowed & term_candidates
+            positions = sorted(narrowed)
+
+        # Positive type and domain terms are answered exactly by the index; verify the rest, negations last and notes after everything
+        terms = sorted((t for t in plan.terms if (t.negated or t.field not in ('type', 'domain')) and t.field != 'note'),
+                       key=lambda t: t.negated)
+        if not terms:
+            return self._verify_notes(list(positions), note_terms)
+        return self._verify_notes([i for i in positions if self._verify(i, terms)], note_terms)
+
+
+# --- Facet Counts ---
+class FacetCounts:
+    """
+    Per-type and per-domain counts of a result set. Counts are derived from the search that produced the
+    results rather than recounted per keystroke: a repeated query reuses the counts cached with its results,
+    and a refined query subtracts only the positions it dropped from the counts of the result it narrowed.
+    Only a refresh counts the whole vault (VaultIndex.facet_totals).
+    """
+    def __init__(self, type_counts=None, domain_counts=None):
+        self.type_counts = type_counts if type_counts is not None else Counter()
+        self.domain_counts = domain_counts if domain_counts is not None else Counter()
+
+    @classmethod
+    def count(cls, vault_index, positions):
+        domain_counts = Counter(map(vault_index.item_domains.__getitem__, positions))
+        domain_counts.pop('', None)
+        return cls(Counter(map(vault_index.item_types.__getitem__, positions)), domain_counts)
+
+    def without(self, vault_index, dropped_positions):
+        """Counts after removing `dropped_positions`, which must all be part of this result set."""
+        dropped = FacetCounts.count(vault_index, dropped_positions)
+        # Counter subtraction keeps positive counts only, so emptied facets disappear
+        return FacetCounts(self.type_counts - dropped.type_counts, self.domain_counts - dropped.domain_counts)
+
+    @classmethod
+    def combine(cls, facet_counts_list):
+        combined = cls()
+        for facet_counts in facet_counts_list:
+            combined.type_counts.update(facet_counts.type_counts)
+            combined.domain_counts.update(facet_counts.domain_counts)
+        return combined
+
+
+# --- Search Result Cache ---
+class CachedResult:
+    """Result positions of a query, plus the facet counts of those results once something asked for them."""
+    __slots__ = ('plan', 'positions', 'facets')
+
+    def __init__(self, plan, positions, facets=None):
+        self.plan = plan
+        self.positions = positions
+        self.facets = facets
+
+
+class QueryResultCache:
+    """
+    Bounded LRU of search results keyed by the parsed query.
+    A query that refines a cached one (e.g. "git" -> "gith", or adding a filter) is answered by filtering
+    the cached result set, and backspacing to an earlier query is an exact hit.
+    Cleared whenever the vault is refreshed.
+    """
+    def __init__(self, max_entries=_QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # plan.key -> CachedResult (positions in the VaultIndex)
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.narrowed = 0
+        self.misses = 0
+
+    def lookup(self, plan):
+        """
+        Returns (entry, None) on an exact hit, (None, base_entry) when the smallest cached result
+        set this plan refines can be filtered, or (None, None) when the full vault has to be searched.
+        """
+        with self._lock:
+            if plan.key in self._entries:
+                self._entries.move_to_end(plan.key)
+                self.hits += 1
+                return self._entries[plan.key], None
+            best_entry = None
+            for cached_entry in self._entries.values():
+                if cached_entry.plan.terms and plan.is_refinement_of(cached_entry.plan) and (best_entry is None or len(cached_entry.positions) < len(best_entry.positions)):
+                    best_entry = cached_entry
+            if best_entry is not None:
+                self._entries.move_to_end(best_entry.plan.key)
+                self.narrowed += 1
+                return None, best_entry
+            self.misses += 1
+            return None, None
+
+    def store(self, entry, generation):
+        """Caches a CachedResult unless the vault was refreshed while it was being computed."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[entry.plan.key] = entry
+            self._entries.move_to_end(entry.plan.key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        return f"{len(self._entries)} entries, {self.hits} hits, {self.narrowed} narrowed, {self.misses} misses"
+
+
+# --- Background Sync ---
+_SYNC_TRANSIENT_MARKERS = ('network', 'timeout', 'timed out', 'econnreset', 'econnrefused', 'enotfound', 'eai_again',
+                           'etimedout', 'socket hang up', 'fetch failed', '429', '502', '503', '504')
+_SYNC_AUTH_MARKERS = ('authentication required', 'not logged in', '2fa', 'two-factor', 'master password')
+
+SyncResult = namedtuple('SyncResult', ['ok', 'message', 'duration', 'attempts', 'auth_required'])
+
+
+class SyncManager:
+    """
+    Runs non-interactive `dcli sync` for a profile that already has a session.
+    Concurrent requests are coalesced into the single in-flight sync, and transient failures
+    (network errors, timeouts) are retried with exponential backoff.
+    Progress can be polled through `started_at` and `attempt`; callbacks are invoked from the sync thread.
+    """
+    def __init__(self, env_provider, name, max_attempts=3, base_delay=2.0, timeout=120):
+        self.env_provider = env_provider
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.timeout = timeout
+        self.started_at = None
+        self.attempt = 0
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._stop_event = threading.Event()
+
+    @property
+    def in_flight(self):
+        return self.started_at is not None
+
+    def request_sync(self, on_complete=None):
+        """
+        Starts a sync, or joins the one already running. `on_complete(SyncResult)` is called once it finishes.
+        Returns True if a new sync was started, False if the request was coalesced.
+        """
+        with self._lock:
+            self._waiters.append(on_complete)
+            if self.started_at is not None:
+                logging.info(f"Sync for '{self.name}' already in progress; request coalesced.")
+                return False
+            self.started_at = time.monotonic()
+            self.attempt = 0
+        threading.Thread(target=self._run, name=f"Sync-{self.name}", daemon=True).start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run_once(self):
+        """Returns (ok, transient, message) for a single dcli sync attempt."""
+        try:
+            result = subprocess.run(['dcli', 'sync'], stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                                    encoding='utf-8', errors='ignore', timeout=self.timeout, env=self.env_provider())
+        except TimeoutExpired:
+            return False, True, f"dcli sync timed out after {self.timeout}s"
+        except FileNotFoundError:
+            return False, False, "dcli not found. Make sure it's in your PATH."
+        if result.returncode == 0:
+            return True, False, "Sync complete"
+        stderr = result.stderr.strip()
+        transient = any(marker in stderr.lower() for marker in _SYNC_TRANSIENT_MARKERS)
+        return False, transient, f"dcli sync exited with code {result.returncode}: {stderr}"
+
+    def _run(self):
+        result = None
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                self.attempt = attempt
+                ok, transient, message = self._run_once()
+                duration = time.monotonic() - self.started_at
+                if ok:
+                    result = SyncResult(True, message, duration, attempt, False)
+                    break
+                auth_required = any(marker in message.lower() for marker in _SYNC_AUTH_MARKERS)
+                if not transient or auth_required or attempt == self.max_attempts:
+                    result = SyncResult(False, message, duration, attempt, auth_required)
+                    break
+                delay = self.base_delay * (2 ** (attempt - 1))
+                logging.warning(f"Sync for '{self.name}' failed transiently ({message}); retrying in {delay:.1f}s.")
+                if self._stop_event.wait(delay):
+                    result = SyncResult(False, "Sync cancelled", time.monotonic() - self.started_at, attempt, False)
+                    break
+        except Exception as e:
+            logging.error(f"Unexpected error during sync for '{self.name}': {e}", exc_info=True)
+            result = SyncResult(False, f"Unexpected error during sync: {e}", time.monotonic() - self.started_at, self.attempt, False)
+        finally:
+            with self._lock:
+                waiters = self._waiters
+                self._waiters = []
+                self.started_at = None
+
+        logging.info(f"Sync for '{self.name}' finished in {result.duration:.1f}s after {result.attempts} attempt(s): {result.message}")
+        for on_complete in waiters:
+            if on_complete:
+                on_complete(result)
+
+
+# --- Tiered Item Store ---
+_COMPACT_ITEM_FIELDS = ('id', 'title', 'login', 'email', 'url', 'website')
+
+
+def encode_record(record):
+    """Compact JSON encoding of a full record, as kept in the item store and its spill file."""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8', errors='surrogatepass')
+
+
+class CompactItem(dict):
+    """
+    The resident part of a vault item: only the fields used for display and search, plus its type.
+    The full record (password, notes, card fields...) is kept by the profile's ItemStore.
+    """
+    __slots__ = ('item_type', 'position')
+
+
+class _SpillFile:
+    """
+    Anonymous temporary file of AES-GCM encrypted records, read back through mmap.
+    The key only exists in memory, so the file is unreadable once the app exits (it is deleted on close anyway).
+    """
+    def __init__(self, record_count):
+        self._file = tempfile.TemporaryFile(prefix='dashlane_gui_spill_')
+        self._cipher = AESGCM(AESGCM.generate_key(bit_length=256))
+        self._offsets = array('Q', [0]) * record_count
+        self._lengths = array('Q', [0]) * record_count
+        self._map = None
+        self.size = 0
+
+    def write(self, position, data):
+        # A record is written once per file and key, so its position is a unique nonce
+        ciphertext = self._cipher.encrypt(position.to_bytes(12, 'big'), data, None)
+        self._file.write(ciphertext)
+        self._offsets[position] = self.size
+        self._lengths[position] = len(ciphertext)
+        self.size += len(ciphertext)
+
+    def finish(self):
+        self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, position):
+        return self._lengths[position] > 0
+
+    def read_data(self, position):
+        offset = self._offsets[position]
+        ciphertext = self._map[offset:offset + self._lengths[position]]
+        return self._cipher.decrypt(position.to_bytes(12, 'big'), ciphertext, None)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class ItemStore:
+    """
+    Tiered storage for a profile's vault. Compact display/search fields of every item stay resident,
+    while full records are kept as compact JSON in an LRU bounded by `budget_bytes` and decoded on each access.
+    Records that don't fit are spilled to an encrypted, memory-mapped temporary file when the optional
+    `cryptography` package is installed, and are otherwise fetched again from dcli when needed.
+    """
+    def __init__(self, name, fetch_records, budget_bytes=_ITEM_CACHE_DEFAULT_MB * 1024 * 1024):
+        self.name = name
+        self.fetch_records = fetch_records # fetch_records(ids) -> {id: full record}, from dcli
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._items = []
+        self._sizes = array('Q')
+        self._resident = OrderedDict() # position -> encoded full record, least recently used first
+        self._resident_bytes = 0
+        self._spill = None
+        self.hits = 0
+        self.misses = 0
+        self.spill_reads = 0
+        self.dcli_fetches = 0
+
+    def replace(self, records):
+        """
+        Takes over a full load, either a list of records or an IngestedVault decoded by the ingestion worker,
+        and returns the CompactItems to index and display in its place.
+        """
+        started = time.perf_counter()
+        if isinstance(records, IngestedVault):
+            items = records.compact_items()
+            encoded_records = (records.record_data(position) for position in range(len(items)))
+        else:
+            items = []
+            for position, record in enumerate(records):
+                item = CompactItem((field, record[field]) for field in _COMPACT_ITEM_FIELDS if field in record)
+                item.item_type = get_item_type(record)
+                item.position = position
+                items.append(item)
+            encoded_records = (encode_record(record) for record in records)
+
+        sizes = array('Q')
+        resident = OrderedDict()
+        resident_bytes = 0
+        spill = None
+        try:
+            for position, data in enumerate(encoded_records):
+                sizes.append(len(data))
+                if spill is None and AESGCM is not None and resident_bytes + len(data) > self.budget_bytes:
+                    # First record over budget: from now on every record is also kept in the spill file
+                    spill = _SpillFile(len(items))
+                    for resident_position, resident_record in resident.items():
+                        spill.write(resident_position, resident_record)
+                if spill is not None:
+                    spill.write(position, data)
+                if resident_bytes + len(data) <= self.budget_bytes:
+                    resident[position] = data
+                    resident_bytes += len(data)
+            if spill is not None:
+                spill.finish()
+        except BaseException:
+            if spill is not None:
+                spill.close()
+            raise
+
+        with self._lock:
+            old_spill = self._spill
+            self._items, self._sizes = items, sizes
+            self._resident, self._resident_bytes = resident, resident_bytes
+            self._spill = spill
+            if old_spill is not None:
+                old_spill.close()
+        logging.info(f"Item store '{self.name}': {len(items)} records stored in {(time.perf_counter() - started) * 1000:.0f} ms; {self.stats()}")
+        return items
+
+    def _owns(self, item):
+        return isinstance(item, CompactItem) and item.position < len(self._items) and self._items[item.position] is item
+
+    def _local_record(self, item, admit=False):
+        """Full record from memory or the spill file, or None if only dcli has it. Caller holds the lock."""
+        if not self._owns(item):
+            return None # From a load that has since been replaced
+        data = self._resident.get(item.position)
+        if data is not None:
+            self._resident.move_to_end(item.position)
+            self.hits += 1
+            return json.loads(data) # A fresh copy each time, so the budget counts exactly what is held
+        self.misses += 1
+        if self._spill is None or item.position not in self._spill:
+            return None
+        self.spill_reads += 1
+        data = self._spill.read_data(item.position)
+        if admit:
+            self._admit(item.position, data)
+        return json.loads(data)
+
+    def _admit(self, position, data):
+        if len(data) > self.budget_bytes:
+            return
+        self._sizes[position] = len(data) # A record refetched from dcli may have changed size
+        self._resident[position] = data
+        self._resident_bytes += len(data)
+        self._evict()
+
+    def _evict(self):
+        while self._resident_bytes > self.budget_bytes and self._resident:
+            position, _ = self._resident.popitem(last=False)
+            self._resident_bytes -= self._sizes[position]
+
+    def get(self, item):
+        """Full record for an item, rehydrated from the spill file or dcli if it isn't resident."""
+        with self._lock:
+            record = self._local_record(item, admit=True)
+        if record is not None:
+            return record
+        if not item.get('id'):
+            return item
+        self.dcli_fetches += 1
+        record = self.fetch_records([item['id']]).get(item['id'], item)
+        with self._lock:
+            if self._owns(item) and item.position not in self._resident:
+                self._admit(item.position, encode_record(record))
+        return record
+
+    def _has_local(self, item):
+        """Whether an item's full record is in memory or the spill file. Caller holds the lock."""
+        return self._owns(item) and (item.position in self._resident or (self._spill is not None and item.position in self._spill))
+
+    def iter_records(self, items):
+        """
+        Yields the full record of each item, in order, without adding them to the LRU. Records only dcli has
+        are fetched in a single call (one bulk listing when there are many, never a process per record) and
+        kept encoded until their turn comes; the rest are rehydrated one at a time as they are consumed.
+        Items that aren't CompactItems are already full records and are passed through.
+        """
+        with self._lock:
+            missing_ids = [item['id'] for item in items
+                           if isinstance(item, CompactItem) and item.get('id') and not self._has_local(item)]
+        encoded = {}
+        if missing_ids:
+            self.dcli_fetches += 1
+            fetched = self.fetch_records(missing_ids)
+            while fetched: # Re-encode as we go, so the decoded listing is released record by record
+                record_id, record = fetched.popitem()
+                encoded[record_id] = encode_record(record)
+        for item in items:
+            if not isinstance(item, CompactItem):
+                yield item
+                continue
+            with self._lock:
+                record = self._local_record(item)
+            if record is None:
+                data = encoded.pop(item.get('id'), None)
+                record = json.loads(data) if data is not None else item
+            yield record
+
+    def get_many(self, items):
+        return list(self.iter_records(items))
+
+    def set_budget(self, budget_bytes):
+        """Applies a new budget; lowering it evicts the least recently used records straight away."""
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def close(self):
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        spill_note = f", {self._spill.size / 1048576:.1f} MB spilled" if self._spill is not None else ""
+        return (f"{len(self._resident)}/{len(self._items)} full records resident "
+                f"({self._resident_bytes / 1048576:.1f} of {self.budget_bytes / 1048576:.0f} MB{spill_note}), "
+                f"{hit_rate:.0%} hit rate over {lookups} lookups, {self.spill_reads} spill reads, {self.dcli_fetches} dcli fetches")
+
+
+# --- Payload Ingestion Worker ---
+_PACKED_COLUMNS = _COMPACT_ITEM_FIELDS + ('type',)
+
+
+def pack_vault_payload(payload):
+    """
+    Decodes, dedupes and classifies a `dcli password list` JSON payload, and packs the result into a few
+    byte buffers for the UI process: a table of interned strings with one index column per compact field
+    (index 0 means the field is absent), and every full record as compact JSON. See IngestedVault.
+    """
+    unique_items_map = {}
+    for record in json.loads(payload):
+        unique_items_map[get_item_key(record)] = record
+
+    string_indexes = {}
+    strings = ['']
+    string_offsets = array('Q', [0, 0])
+    columns = {field: array('I') for field in _PACKED_COLUMNS}
+    record_offsets = array('Q', [0])
+    record_parts = []
+    records_size = 0
+    for record in unique_items_map.values():
+        for field in _PACKED_COLUMNS:
+            value = get_item_type(record) if field == 'type' else record.get(field)
+            index = 0
+            if isinstance(value, str):
+                index = string_indexes.get(value)
+                if index is None:
+                    index = string_indexes[value] = len(strings)
+                    strings.append(value)
+                    string_offsets.append(string_offsets[-1] + len(value))
+            columns[field].append(index)
+        data = encode_record(record)
+        record_parts.append(data)
+        records_size += len(data)
+        record_offsets.append(records_size)
+
+    header = json.dumps({'count': len(unique_items_map)}).encode('utf-8')
+    return ([header, ''.join(strings).encode('utf-8', errors='surrogatepass'), string_offsets.tobytes()]
+            + [columns[field].tobytes() for field in _PACKED_COLUMNS]
+            + [b''.join(record_parts), record_offsets.tobytes()])
+
+
+def _ingest_worker_main(connection):
+    """Entry point of the ingestion process: one payload in, its packed buffers (or an error header) out."""
+    while True:
+        try:
+            payload = connection.recv_bytes()
+        except EOFError:
+            return
+        if not payload:
+            return
+        try:
+            buffers = pack_vault_payload(payload)
+        except json.JSONDecodeError as e:
+            buffers = [json.dumps({'error': e.msg, 'pos': e.pos}).encode('utf-8')]
+        except Exception as e:
+            buffers = [json.dumps({'error': f"{type(e).__name__}: {e}"}).encode('utf-8')]
+        connection.send_bytes(len(buffers).to_bytes(4, 'big'))
+        for buffer in buffers:
+            connection.send_bytes(buffer)
+        del payload, buffers
+
+
+class IngestedVault:
+    """A vault packed by pack_vault_payload. Compact items are rebuilt from the string table; records stay encoded."""
+    def __init__(self, buffers):
+        header, strings_blob, string_offsets_bytes = buffers[:3]
+        column_buffers = buffers[3:3 + len(_PACKED_COLUMNS)]
+        records_blob, record_offsets_bytes = buffers[3 + len(_PACKED_COLUMNS):]
+        self.count = json.loads(header)['count']
+        text = strings_blob.decode('utf-8', errors='surrogatepass')
+        string_offsets = array('Q')
+        string_offsets.frombytes(string_offsets_bytes)
+        self._strings = [text[string_offsets[i]:string_offsets[i + 1]] for i in range(len(string_offsets) - 1)]
+        self._columns = []
+        for column_bytes in column_buffers:
+            column = array('I')
+            column.frombytes(column_bytes)
+            self._columns.append(column)
+        self._records = memoryview(records_blob)
+        self._record_offsets = array('Q')
+        self._record_offsets.frombytes(record_offsets_bytes)
+
+    def __len__(self):
+        return self.count
+
+    def compact_items(self):
+        strings = self._strings
+        field_columns = list(zip(_COMPACT_ITEM_FIELDS, self._columns))
+        type_column = self._columns[-1]
+        items = []
+        for position in range(self.count):
+            item = CompactItem((field, strings[column[position]]) for field, column in field_columns if column[position])
+            item.item_type = strings[type_column[position]]
+            item.position = position
+            items.append(item)
+        return items
+
+    def record_data(self, position):
+        return bytes(self._records[self._record_offsets[position]:self._record_offsets[position + 1]])
+
+
+class IngestWorker:
+    """
+    A long-lived helper process that decodes large dcli payloads, so the multi-megabyte json.loads and the
+    dedupe/classification loops don't hold this process's GIL (and stall the Tk main loop) during a refresh.
+    Started on first use; one payload is processed at a time.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = None
+        self._connection = None
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        context = multiprocessing.get_context('spawn') # Never fork a process that runs Tk and threads
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(target=_ingest_worker_main, args=(child_connection,), name='DashlaneIngest', daemon=True)
+        self._process.start()
+        child_connection.close()
+        logging.info(f"Started ingestion worker process (pid {self._process.pid}).")
+
+    def ingest(self, payload):
+        """
+        Returns an IngestedVault for a payload (bytes). Raises json.JSONDecodeError for invalid JSON,
+        and OSError/EOFError if the worker process is unavailable.
+        """
+        with self._lock:
+            self._ensure_started()
+            try:
+                self._connection.send_bytes(payload)
+                buffer_count = int.from_bytes(self._connection.recv_bytes(), 'big')
+                buffers = [self._connection.recv_bytes() for _ in range(buffer_count)]
+            except (OSError, EOFError):
+                self._stop()
+                raise
+        header = json.loads(buffers[0])
+        if 'error' in header:
+            if 'pos' in header:
+                raise json.JSONDecodeError(header['error'], payload.decode('utf-8', errors='ignore'), header['pos'])
+            raise RuntimeError(f"Ingestion worker failed: {header['error']}")
+        return IngestedVault(buffers)
+
+    def _stop(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._process is not None:
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.send_bytes(b'')
+                except OSError:
+                    pass
+            self._stop()
+
+
+class MainLoopProbe:
+    """
+    Measures how promptly the Tk main loop services a fixed-interval timer while background work runs:
+    the gaps between ticks approximate frame times, so spikes are what the user sees as stutter.
+    Start and stop it on the Tk thread.
+    """
+    def __init__(self, widget, interval_ms=16):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.frame_times = []
+        self._after_id = None
+        self._last_tick = None
+
+    def start(self):
+        self._last_tick = time.perf_counter()
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.frame_times.append((now - self._last_tick) * 1000)
+        self._last_tick = now
+        self._after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        """Stops the probe and returns a summary, or None if it wasn't running."""
+        if self._after_id is None:
+            return None
+        self.widget.after_cancel(self._after_id)
+        self._after_id = None
+        if not self.frame_times:
+            return "no frames completed"
+        frame_times = sorted(self.frame_times)
+        p95 = frame_times[min(len(frame_times) - 1, int(len(frame_times) * 0.95))]
+        return (f"{len(frame_times)} frames, median {frame_times[len(frame_times) // 2]:.0f} ms, "
+                f"p95 {p95:.0f} ms, worst {frame_times[-1]:.0f} ms (target {self.interval_ms} ms)")
+
+
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+
+
+def _pause_gc():
+    """Disables the cyclic collector until the matching _resume_gc. Pauses from concurrent profile loads nest."""
+    global _gc_pause_depth
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            gc.disable()
+        _gc_pause_depth += 1
+
+
+def _resume_gc():
+    """Ends a pause; the collector is re-enabled once no profile load is building any more."""
+    global _gc_pause_depth
+    with _gc_pause_lock:
+        _gc_pause_depth -= 1
+        if _gc_pause_depth == 0:
+            gc.enable()
+
+
+# --- Account Profiles ---
+class VaultProfile:
+    """
+    A named Dashlane account. Each profile runs dcli with its own environment, so it gets its own
+    dcli configuration and session, and keeps its own in-memory vault, index, result cache and search history.
+    """
+    def __init__(self, name, config_section, dcli_home='', dcli_env=None, search_history=None):
+        self.name = name
+        self.config_section = config_section # Where this profile's search history is persisted
+        self.dcli_home = dcli_home
+        self.extra_env = dcli_env or {}
+        self.search_history = search_history or []
+        self.vault_items = None
+        self.vault_index = None
+        self.query_cache = QueryResultCache()
+        self.audit_cache = None # (vault_index, findings) until the next refresh
+        self.loading = False
+        self.payload_digest = None # Hash of the last full dcli payload, to skip refreshes that change nothing
+        self.sync_manager = SyncManager(self.dcli_env, name)
+        self.item_store = ItemStore(name, self.fetch_records)
+
+    def dcli_env(self):
+        """Environment for this profile's dcli processes, or None to inherit the app's environment."""
+        if not self.dcli_home and not self.extra_env:
+            return None
+        env = os.environ.copy()
+        if self.dcli_home:
+            # dcli keeps its configuration and local vault under the user's home/app-data directories
+            home = os.path.expanduser(self.dcli_home)
+            env.update({
+                'HOME': home,
+                'USERPROFILE': home,
+                'XDG_CONFIG_HOME': os.path.join(home, '.config'),
+                'XDG_DATA_HOME': os.path.join(home, '.local', 'share'),
+                'APPDATA': os.path.join(home, 'AppData', 'Roaming'),
+                'LOCALAPPDATA': os.path.join(home, 'AppData', 'Local')
+            })
+        env.update({key: str(value) for key, value in self.extra_env.items()})
+        return env
+
+    def set_vault_items(self, items):
+        """A full load becomes the in-memory vault that later searches run against."""
+        started = time.perf_counter()
+        previous_index = self.vault_index
+        # A full collection during the build would walk every new object while holding the GIL and stall the Tk loop
+        _pause_gc()
+        try:
+            # Only compact items stay resident; full records go to the tiered store. Built on the loading thread, not the Tk loop
+            compact_items = self.item_store.replace(items)
+            vault_index = VaultIndex(compact_items, full_records=self.item_store.get_many)
+        finally:
+            _resume_gc()
+        self.vault_index = vault_index
+        self.vault_items = compact_items
+        self.query_cache.clear()
+        logging.info(f"Profile '{self.name}': in-memory vault replaced with {len(items)} items (indexed in {(time.perf_counter() - started) * 1000:.0f} ms); search cache invalidated.")
+        if previous_index is not None:
+            previous_keys, new_keys = set(previous_index.item_keys), set(vault_index.item_keys)
+            logging.info(f"Profile '{self.name}': refresh delta +{len(new_keys - previous_keys)} / -{len(previous_keys - new_keys)} items.")
+        return vault_index
+
+    def search_positions(self, search_term):
+        """
+        Searches the in-memory vault, reusing cached results for repeated or extended queries.
+        Returns (vault_index, positions), or (None, None) if no full load has completed yet.
+        Safe to call from worker threads.
+        """
+        vault_index, entry, _ = self._search(search_term)
+        return vault_index, entry.positions if entry else None
+
+    def search_with_facets(self, search_term):
+        """Like search_positions, plus the FacetCounts of the results: (vault_index, positions, facets)."""
+        vault_index, entry, base_entry = self._search(search_term)
+        if vault_index is None:
+            return None, None, None
+        if entry.facets is None:
+            positions = entry.positions
+            if not entry.plan.terms:
+                entry.facets = vault_index.facet_totals
+            elif base_entry is not None and base_entry.facets is not None and len(base_entry.positions) - len(positions) < len(positions):
+                # Narrowed a cached result: only the positions the refinement dropped are counted
+                entry.facets = base_entry.facets.without(vault_index, set(base_entry.positions).difference(positions))
+            else:
+                entry.facets = FacetCounts.count(vault_index, positions) # Dropped most of the base, or nothing to start from
+        return vault_index, entry.positions, entry.facets
+
+    def _search(self, search_term):
+        """Returns (vault_index, CachedResult, base CachedResult it was narrowed from or None)."""
+        generation = self.query_cache.generation # Read before the vault so a concurrent refresh rejects our store
+        vault_index = self.vault_index
+        if vault_index is None:
+            return None, None, None
+        plan = parse_query(search_term)
+        entry, base_entry = self.query_cache.lookup(plan)
+        if entry is None:
+            positions = vault_index.search_positions(plan, within=base_entry.positions if base_entry else None)
+            entry = CachedResult(plan, positions)
+            self.query_cache.store(entry, generation)
+            logging.debug(f"Profile '{self.name}': evaluated {len(plan.terms)}-term query, {len(positions)} results (cache: {self.query_cache.stats()}).")
+        return vault_index, entry, base_entry
+
+    def search(self, search_term):
+        """Like search_positions, but returns the matching items (or None before the first load)."""
+        vault_index, positions = self.search_positions(search_term)
+        if vault_index is None:
+            return None
+        return [vault_index.items[i] for i in positions]
+
+    def load_item_details(self, item):
+        """
+        Full record for `item`, including its secrets: from the item store for loaded items, as-is for records
+        from `dcli password list`, and otherwise looked up again by id. May block on dcli, so call it from a worker thread.
+        """
+        if isinstance(item, CompactItem):
+            return self.item_store.get(item)
+        if 'password' in item or not item.get('id'):
+            return item
+        return self.fetch_records([item['id']]).get(item['id'], item)
+
+    def fetch_records(self, item_ids):
+        """
+        Full records from dcli as {id: record}: one `id=` lookup per id for a few ids, a single full listing for many.
+        Raises RuntimeError if dcli fails.
+        """
+        wanted = set(item_ids)
+        if len(wanted) > _DCLI_BULK_FETCH_THRESHOLD:
+            filter_sets = [_DCLI_BROAD_FILTERS]
+        else:
+            filter_sets = [[f"id={item_id}"] for item_id in wanted]
+        records = {}
+        for filters in filter_sets:
+            command = ["dcli", "password", "list", *filters, "--output", "json"]
+            try:
+                result = subprocess.run(command, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                                        encoding='utf-8', errors='ignore', timeout=30, env=self.dcli_env())
+                if result.returncode != 0:
+                    raise RuntimeError(f"dcli exited with code {result.returncode}: {result.stderr.strip()}")
+                listed = json.loads(result.stdout)
+            except (OSError, TimeoutExpired, json.JSONDecodeError) as e:
+                raise RuntimeError(f"Could not fetch records from dcli: {e}") from e
+            for record in listed:
+                if record.get('id') in wanted:
+                    records[record['id']] = record
+        logging.info(f"Profile '{self.name}': fetched {len(records)}/{len(wanted)} full records from dcli.")
+        return records
+
+
+def load_profiles(app_config):
+    """
+    Reads [PROFILE:<name>] sections (dcli_home, dcli_env as a JSON object, search_history).
+    Without any, a single 'Default' profile uses the plain dcli environment and the [SETTINGS] history.
+    """
+    profiles = OrderedDict()
+    for section in app_config.sections():
+        if not section.startswith('PROFILE:'):
+            continue
+        name = section[len('PROFILE:'):].strip()
+        profile_config = app_config[section]
+        try:
+            dcli_env = json.loads(profile_config.get('dcli_env', '{}'))
+            search_history = json.loads(profile_config.get('search_history', '[]'))
+        except ValueError as e:
+            logging.error(f"Invalid JSON in profile section [{section}]: {e}. Using defaults.")
+            dcli_env, search_history = {}, []
+        profiles[name] = VaultProfile(name, section, profile_config.get('dcli_home', '').strip(), dcli_env, search_history)
+
+    if not profiles:
+        profiles['Default'] = VaultProfile('Default', 'SETTINGS', search_history=json.loads(app_config['SETTINGS']['search_history']))
+    return profiles
+
+
+# --- Details Prefetch ---
+class DetailsPrefetcher:
+    """
+    Speculatively loads full item details for the selected row and its neighbours so that opening the
+    details window does not wait on dcli. Loaded details are kept in a small cache for a short time only,
+    since they contain secrets. Queued prefetches for rows the selection has moved away from are cancelled,
+    and at most `max_workers` loads run at once.
+    """
+    def __init__(self, loader, max_entries=16, ttl_seconds=30.0, max_workers=2):
+        self.loader = loader # loader(profile, item) -> full item dict
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='DetailsPrefetch')
+        self._lock = threading.Lock()
+        self._cache = OrderedDict() # key -> (expires_at, details), oldest first
+        self._pending = {} # key -> Future
+        self._awaited = set() # keys of pending loads that a get() is waiting on, which are never cancelled
+        self._generation = 0 # Bumped by clear(), so loads started before it don't repopulate the cache
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.cancelled = 0
+
+    @staticmethod
+    def _key(profile, item):
+        return (profile.name, get_item_key(item))
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[key]
+            return None
+        return entry[1]
+
+    def _load(self, key, profile, item, generation):
+        try:
+            details = self.loader(profile, item)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+        with self._lock:
+            if generation != self._generation:
+                return details # Loaded before a refresh; hand it to a waiting get() but don't cache it
+            self._cache[key] = (time.monotonic() + self.ttl_seconds, details)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return details
+
+    def prefetch(self, requests):
+        """
+        `requests` is a priority-ordered list of (profile, item) to have ready; queued loads
+        for anything not in it are cancelled.
+        """
+        with self._lock:
+            wanted = [(self._key(profile, item), profile, item) for profile, item in requests]
+            wanted_keys = {key for key, _, _ in wanted}
+            for key, future in list(self._pending.items()):
+                if key not in wanted_keys and key not in self._awaited and future.cancel():
+                    del self._pending[key]
+                    self.cancelled += 1
+            for key, profile, item in wanted:
+                if key in self._pending or self._cached(key) is not None:
+                    continue
+                self._pending[key] = self._executor.submit(self._load, key, profile, item, self._generation)
+                self.prefetched += 1
+
+    def get(self, profile, item, on_ready):
+        """
+        Calls `on_ready(details, error)` with the full record: immediately on a cache hit, otherwise
+        from a worker thread once the (possibly already running) load finishes.
+        """
+        key = self._key(profile, item)
+        with self._lock:
+            details = self._cached(key)
+            if details is None:
+                self.misses += 1
+                future = self._pending.get(key)
+                if future is None:
+                    future = self._pending[key] = self._executor.submit(self._load, key, profile, item, self._generation)
+                self._awaited.add(key)
+            else:
+                self.hits += 1
+        logging.info(f"Details prefetch cache: {self.stats()}")
+        if details is not None:
+            on_ready(details, None)
+            return
+
+        def deliver(done_future):
+            with self._lock:
+                self._awaited.discard(key)
+            if done_future.cancelled(): # Only possible if the executor was shut down
+                on_ready(None, RuntimeError("Loading the item details was cancelled."))
+                return
+            error = done_future.exception()
+            on_ready(None if error else done_future.result(), error)
+        future.add_done_callback(deliver)
+
+    def clear(self):
+        """Drops cached details, e.g. after a refresh replaced the vault, including any loads still in flight."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return f"{self.hits}/{lookups} hits ({hit_rate:.0%}), {self.prefetched} prefetched, {self.cancelled} cancelled, {len(self._cache)} cached"
+
+
+# --- Vault Health Audit ---
+_COMMON_PASSWORDS = {
+    'password', 'password1', '123456', '12345678', '123456789', '1234567890', 'qwerty', 'qwerty123',
+    'abc123', 'letmein', 'welcome', 'admin', 'iloveyou', 'monkey', 'dragon', 'sunshine', 'passw0rd', '111111'
+}
+
+AuditFinding = namedtuple('AuditFinding', ['issue', 'item', 'detail'])
+
+
+def get_password_weakness(password):
+    """Returns why a password is weak, or None if it looks acceptable."""
+    if password.lower() in _COMMON_PASSWORDS:
+        return "Common password"
+    if len(password) < 8:
+        return f"Only {len(password)} characters"
+    character_classes = sum([any(c.islower() for c in password), any(c.isupper() for c in password),
+                             any(c.isdigit() for c in password), any(not c.isalnum() for c in password)])
+    if len(password) < 12 and character_classes < 3:
+        return f"{len(password)} characters, {character_classes} character classes"
+    return None
+
+
+class VaultAuditor:
+    """
+    Finds reused passwords, near-duplicate entries (same login and domain under different ids),
+    weak passwords and logins without a username. Passwords are only compared as HMAC digests
+    under a key that lives for a single audit, so no plaintext pairs are collected.
+    Work is split into chunks on a thread pool; `progress_callback(done, total)` is called from
+    worker threads and setting `cancel_event` stops the audit early.
+    Findings refer to `display_items` (e.g. the CompactItems of the index, position for position) when
+    given, so keeping them doesn't keep the full records and their passwords.
+    """
+    CHUNK_SIZE = 1000
+
+    def __init__(self, items, progress_callback=None, max_workers=None, display_items=None):
+        self.items = items
+        self.display_items = display_items if display_items is not None else items
+        self.progress_callback = progress_callback
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._hash_key = secrets.token_bytes(32)
+
+    def _audit_chunk(self, start, cancel_event):
+        password_groups = {} # digest -> [positions]
+        identity_groups = {} # (login, domain) -> [positions]
+        findings = []
+        for position in range(start, min(start + self.CHUNK_SIZE, len(self.items))):
+            if cancel_event.is_set():
+                return None
+            item = self.items[position]
+            password = item.get('password')
+            if not password:
+                continue
+            digest = hmac.new(self._hash_key, password.encode('utf-8'), hashlib.sha256).digest()
+            password_groups.setdefault(digest, []).append(position)
+
+            login = (item.get('login') or item.get('email') or '').strip().lower()
+            if not login:
+                findings.append(AuditFinding("Empty Login", self.display_items[position], "Login item has no username or email"))
+            else:
+                domain = get_item_domain(item)
+                if domain:
+                    identity_groups.setdefault((login, domain), []).append(position)
+
+            weakness = get_password_weakness(password)
+            if weakness:
+                findings.append(AuditFinding("Weak Password", self.display_items[position], weakness))
+        return password_groups, identity_groups, findings
+
+    def run(self, cancel_event):
+        """Runs the audit and returns a list of AuditFinding, or None if it was cancelled."""
+        chunk_starts = range(0, len(self.items), self.CHUNK_SIZE)
+        password_groups = {}
+        identity_groups = {}
+        findings = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="VaultAudit") as executor:
+            futures = [executor.submit(self._audit_chunk, start, cancel_event) for start in chunk_starts]
+            for done, future in enumerate(as_completed(futures), start=1):
+                chunk_result = future.result()
+                if chunk_result is None or cancel_event.is_set():
+                    cancel_event.set()
+                    return None
+                chunk_passwords, chunk_identities, chunk_findings = chunk_result
+                for digest, positions in chunk_passwords.items():
+                    password_groups.setdefault(digest, []).extend(positions)
+                for identity, positions in chunk_identities.items():
+                    identity_groups.setdefault(identity, []).extend(positions)
+                findings.extend(chunk_findings)
+                if self.progress_callback:
+                    self.progress_callback(done, len(futures))
+
+        for positions in password_groups.values():
+            if len(positions) > 1:
+                for position in positions:
+                    findings.append(AuditFinding("Reused Password", self.display_items[position], f"Shared with {len(positions) - 1} other item(s)"))
+        for positions in identity_groups.values():
+            distinct_keys = {get_item_key(self.items[position]) for position in positions}
+            if len(distinct_keys) > 1:
+                for position in positions:
+                    findings.append(AuditFinding("Near Duplicate", self.display_items[position], f"Same login and domain as {len(positions) - 1} other item(s)"))
+        return findings
+
+
+# --- Export ---
+_EXPORT_METADATA_FIELDS = ['title', 'login', 'url', 'type', 'id']
+_EXPORT_SECRET_FIELDS = ['password', 'note']
+
+
+def export_items(items, file_path, export_format, include_secrets=False, progress_callback=None, cancel_event=None):
+    """
+    Streams items to a CSV or JSON file one row at a time, so memory stays flat for large views.
+    Writes to a temporary file next to the target and renames it into place once complete.
+    Returns the number of rows written, or None if cancelled.
+    """
+    fields = _EXPORT_METADATA_FIELDS + (_EXPORT_SECRET_FIELDS if include_secrets else [])
+    temp_path = f"{file_path}.part"
+    # Exports that contain secrets are only readable by the current user
+    file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600 if include_secrets else 0o644)
+    rows_written = 0
+    try:
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8', newline='') as f:
+            csv_writer = None
+            if export_format == 'csv':
+                csv_writer = csv.writer(f)
+                csv_writer.writerow(fields)
+            else:
+                f.write('[')
+
+            for item in items:
+                if cancel_event and cancel_event.is_set():
+                    break
+                row = public_item_fields(item)
+                if include_secrets:
+                    row['password'] = item.get('password', '')
+                    row['note'] = item.get('note', '')
+                if csv_writer:
+                    csv_writer.writerow([row[field] for field in fields])
+                else:
+                    f.write(('\n  ' if rows_written == 0 else ',\n  ') + json.dumps({field: row[field] for field in fields}, ensure_ascii=False))
+                rows_written += 1
+                if progress_callback and rows_written % 1000 == 0:
+                    progress_callback(rows_written)
+
+            if export_format != 'csv':
+                f.write('\n]\n')
+
+        if cancel_event and cancel_event.is_set():
+            os.unlink(temp_path)
+            return None
+        os.replace(temp_path, file_path)
+        return rows_written
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+# --- Local Query Socket API ---
+class LocalQueryServer:
+    """
+    Serves read-only searches over the app's in-memory vault on a local Unix domain socket.
+    Clients send one JSON object per line, e.g. {"token": "...", "query": "git", "limit": 20},
+    optionally with "profile" set to a profile name or "*" for all profiles, and receive one
+    JSON object per line back. Only metadata is returned, never passwords.
+    """
+    MAX_REQUEST_BYTES = 64 * 1024
+
+    def __init__(self, search_function, socket_path):
+        self.search_function = search_function
+        self.socket_path = socket_path
+        self.token_path = socket_path + '.token'
+        self.token = secrets.token_urlsafe(32)
+        self._server_socket = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("Unix domain sockets are not supported on this platform.")
+
+        socket_dir = os.path.dirname(os.path.abspath(self.socket_path))
+        if socket_dir == os.path.dirname(_QUERY_SOCKET_DEFAULT_PATH):
+            # The app's own directory: create it and keep it private
+            os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+            os.chmod(socket_dir, 0o700)
+        elif os.stat(socket_dir).st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            # Someone else's directory is never chmod'ed; a shared writable one could let others replace the socket
+            raise OSError(f"Refusing to create the socket in {socket_dir}: the directory is writable by other users.")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path) # Stale socket from a previous run
+
+        self._server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177) # Socket file is created owner read/write only
+        try:
+            self._server_socket.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+        self._server_socket.listen(8)
+        self._server_socket.settimeout(0.5)
+
+        if os.path.exists(self.token_path):
+            os.unlink(self.token_path)
+        token_fd = os.open(self.token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(token_fd, 'w') as f:
+            f.write(self.token)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._serve, name="LocalQueryServer", daemon=True)
+        self._thread.start()
+        logging.info(f"Local query socket listening on {self.socket_path}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._server_socket:
+            self._server_socket.close()
+            self._server_socket = None
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        for path in (self.socket_path, self.token_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        logging.info("Local query socket stopped.")
+
+    def _serve(self):
+        while not self._stop_event.is_set():
+            try:
+                conn, _ = self._server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break # Socket closed by stop()
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def _handle_connection(self, conn):
+        with conn:
+            conn.settimeout(10)
+            buffer = b''
+            try:
+                while not self._stop_event.is_set():
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    if len(buffer) > self.MAX_REQUEST_BYTES:
+                        conn.sendall(json.dumps({'ok': False, 'error': 'request too large'}).encode('utf-8') + b'\n')
+                        break
+                    while b'\n' in buffer:
+                        line, buffer = buffer.split(b'\n', 1)
+                        if line.strip():
+                            response = self.handle_request(line)
+                            conn.sendall(json.dumps(response).encode('utf-8') + b'\n')
+            except (socket.timeout, OSError) as e:
+                logging.debug(f"Local query connection closed: {e}")
+
+    def handle_request(self, raw_request):
+        """Parse, authenticate and execute a single request line. Returns the response dict."""
+        started = time.perf_counter()
+        try:
+            request = json.loads(raw_request)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            return {'ok': False, 'error': f"invalid request: {e}"}
+
+        if not hmac.compare_digest(str(request.get('token', '')), self.token):
+            logging.warning("Local query socket rejected a request with an invalid token.")
+            return {'ok': False, 'error': 'invalid token'}
+
+        op = request.get('op', 'search')
+        if op == 'ping':
+            return {'ok': True}
+        if op != 'search':
+            return {'ok': False, 'error': f"unknown op '{op}'"}
+
+        try:
+            limit = int(request.get('limit') or 0)
+        except (TypeError, ValueError):
+            return {'ok': False, 'error': 'limit must be an integer'}
+        if limit < 0:
+            return {'ok': False, 'error': 'limit must not be negative'}
+
+        profile_name = request.get('profile')
+        if profile_name is not None and not isinstance(profile_name, str):
+            return {'ok': False, 'error': 'profile must be a string'}
+
+        try:
+            results = self.search_function(str(request.get('query', '')), profile_name)
+        except KeyError:
+            return {'ok': False, 'error': f"unknown profile '{request.get('profile')}'"}
+        except RuntimeError as e: # note: terms may have to fetch full records from dcli
+            return {'ok': False, 'error': f"search failed: {e}"}
+        if results is None:
+            return {'ok': False, 'error': 'vault not loaded yet'}
+        if limit:
+            results = results[:limit]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logging.debug(f"Local query socket answered with {len(results)} items in {elapsed_ms:.1f} ms.")
+        return {
+            'ok': True,
+            'count': len(results),
+            'elapsed_ms': round(elapsed_ms, 2),
+            'items': [dict(public_item_fields(item), profile=profile_name) for profile_name, item in results]
+        }
+
+
 # --- App Class Definition ---
 class App(tk.Tk):
     def __init__(self):
@@ -62,7 +1624,13 @@ class App(tk.Tk):
             'window_x': '0',
             'window_y': '0',
             'window_width': '600',
-            'window_height': '500'
+            'window_height': '500',
+            'query_socket_enabled': 'false',
+            'query_socket_path': '',
+            'active_profile': '',
+            'auto_sync_minutes': '0',
+            'item_cache_mb': str(_ITEM_CACHE_DEFAULT_MB),
+            'ingest_worker_enabled': 'true'
         }
 
         try:
@@ -77,13 +1645,38 @@ class App(tk.Tk):
             logging.error(f"Error loading configuration: {e}")
 
         self.CLIPBOARD_CLEAR_DELAY_SECONDS = int(self.app_config['SETTINGS']['clipboard_clear_delay_seconds'])
-        self.SEARCH_HISTORY = json.loads(self.app_config['SETTINGS']['search_history'])
+
+        # Account profiles, each with its own dcli environment, in-memory vault and search history
+        self.profiles = load_profiles(self.app_config)
+        active_profile_name = self.app_config['SETTINGS'].get('active_profile', '')
+        self.active_profile = self.profiles.get(active_profile_name) or next(iter(self.profiles.values()))
+        self.SEARCH_HISTORY = self.active_profile.search_history
+        self.apply_item_cache_budget()
+        logging.info(f"Loaded {len(self.profiles)} profile(s); active profile is '{self.active_profile.name}'.")
 
         # Global variables for application state
         self.CURRENTLY_DISPLAYED_ITEMS = []
+        self._displayed_item_profiles = {} # id(item) -> profile name, only for cross-profile results
+        self.query_server = None
+        self.facet_counts = FacetCounts()
+        self._facet_labels = ([], [])
+        self._facet_type_values = []
+        self._facet_domain_values = []
+        self._export_cancel_event = None
+        self._auto_sync_id = None
+        self._search_history_id = None
+        self.ingest_worker = IngestWorker()
+        self.details_prefetcher = DetailsPrefetcher(lambda profile, item: profile.load_item_details(item))
+        self._selection_direction = 1 # +1 when navigating down the list, -1 when navigating up
+        self.details_window = None # Built on first use, then withdrawn and relabelled instead of destroyed
+        self._details_widgets = {}
+        self._details_item = ('', '', '') # (title, login, password) on display
+        self._details_request_seq = 0 # Bumped per details request so late results for an earlier row are dropped
+        self._search_seq = 0 # Bumped per search so a late note: search result is dropped
         self._treeview_sort_orders = {}
         self._countdown_id = None
         self._countdown_seconds_remaining = 0
+        self._copy_restore_ids = {} # button -> pending after() id that puts it back after "Copied!"
 
         # Set the window icon
         try:
@@ -199,13 +1792,13 @@ class App(tk.Tk):
             # Check if dcli command exists
             logging.info("Attempting to run 'dcli --version' to confirm dcli presence...")
             # Added a timeout to prevent hanging if dcli isn't responding quickly
-            subprocess.run(['dcli', '--version'], check=True, capture_output=True, text=True, encoding='utf-8', timeout=5)
+            subprocess.run(['dcli', '--version'], check=True, capture_output=True, text=True, encoding='utf-8', timeout=5, env=self.active_profile.dcli_env())
             logging.info("✔ 'dcli --version' successful, dcli command is found.")
 
             # Check if dcli is logged in
             logging.info("Running 'dcli accounts whoami' to check login status...")
             # Added a timeout to prevent hanging if it's waiting for interactive input (e.g., master password)
-            result = subprocess.run(['dcli', 'accounts', 'whoami'], capture_output=True, text=True, check=False, encoding='utf-8', timeout=10)
+            result = subprocess.run(['dcli', 'accounts', 'whoami'], capture_output=True, text=True, check=False, encoding='utf-8', timeout=10, env=self.active_profile.dcli_env())
 
             logging.info(f"dcli whoami - Return Code: {result.returncode}")
             logging.info(f"dcli whoami - STDOUT: '{result.stdout.strip()}'")
@@ -284,7 +1877,8 @@ class App(tk.Tk):
                 stderr=sys.stderr, # Pass stderr to dcli
                 encoding='utf-8',
                 errors='ignore',
-                shell=False # Safer for direct command execution
+                shell=False, # Safer for direct command execution
+                env=self.active_profile.dcli_env()
             )
             # Wait for the sync process to complete
             process.wait() # This will block until dcli sync exits
@@ -304,7 +1898,8 @@ class App(tk.Tk):
                 text=True,
                 check=False,
                 encoding='utf-8',
-                timeout=10 # Add timeout for this post-sync check
+                timeout=10, # Add timeout for this post-sync check
+                env=self.active_profile.dcli_env()
             )
 
             # CORRECTED LOGIC: Check for successful return code AND non-empty output, or output containing '@'
@@ -349,10 +1944,15 @@ class App(tk.Tk):
 
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Export Current View...", command=self.export_current_view)
         file_menu.add_command(label="Settings...", command=self.open_settings_window)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.on_closing)
 
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        tools_menu.add_command(label="Vault Health Audit...", command=self.open_audit_window)
+
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="About", command=self.show_about_window)
@@ -367,14 +1967,43 @@ class App(tk.Tk):
         self.entry_site_name.pack(side=tk.LEFT, expand=True, fill=tk.X)
         self.entry_site_name.focus_set()
         self.entry_site_name.bind('<KeyRelease>', self.filter_treeview_items)
-        self.entry_site_name.bind('<<ComboboxSelected>>', self.filter_treeview_items)
+        self.entry_site_name.bind('<Return>', self.on_search_committed)
+        self.entry_site_name.bind('<<ComboboxSelected>>', self.on_search_committed)
 
         clear_button = ttk.Button(search_frame, text="X", width=3, command=self.clear_search_field)
         clear_button.pack(side=tk.LEFT, padx=(5,0))
 
+        self.search_all_profiles_var = tk.BooleanVar(value=False)
+        if len(self.profiles) > 1:
+            self.profile_var = tk.StringVar(value=self.active_profile.name)
+            profile_combobox = ttk.Combobox(search_frame, width=14, state='readonly', values=list(self.profiles), textvariable=self.profile_var)
+            profile_combobox.pack(side=tk.RIGHT, padx=(5, 0))
+            profile_combobox.bind('<<ComboboxSelected>>', lambda event: self.switch_profile(self.profile_var.get()))
+            ttk.Label(search_frame, text="Profile:", style='MainContent.TLabel').pack(side=tk.RIGHT, padx=(10, 0))
+            ttk.Checkbutton(search_frame, text="All profiles", variable=self.search_all_profiles_var,
+                            command=self.filter_treeview_items).pack(side=tk.RIGHT, padx=(10, 0))
+
         treeview_frame = ttk.Frame(self.main_gui_frame, style='MainContent.TFrame')
         treeview_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
 
+        # Facet sidebar: counts per type and per website domain of the current results, click to filter
+        facet_frame = ttk.Frame(treeview_frame, style='MainContent.TFrame')
+        facet_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+
+        ttk.Label(facet_frame, text="Types", font=('Arial', 10, 'bold'), style='MainContent.TLabel').pack(anchor=tk.W)
+        self.facet_type_listbox = Listbox(facet_frame, width=22, height=8, exportselection=False, activestyle='none',
+                                          bg=DL_COLORS["main_bg_light"], fg=DL_COLORS["text_dark"], relief=tk.FLAT, borderwidth=0,
+                                          selectbackground=DL_COLORS["highlight_blue"], selectforeground=DL_COLORS["text_light"], highlightthickness=0)
+        self.facet_type_listbox.pack(fill=tk.X, pady=(0, 10))
+        self.facet_type_listbox.bind('<<ListboxSelect>>', lambda event: self.on_facet_select(event, 'type'))
+
+        ttk.Label(facet_frame, text="Domains", font=('Arial', 10, 'bold'), style='MainContent.TLabel').pack(anchor=tk.W)
+        self.facet_domain_listbox = Listbox(facet_frame, width=22, exportselection=False, activestyle='none',
+                                            bg=DL_COLORS["main_bg_light"], fg=DL_COLORS["text_dark"], relief=tk.FLAT, borderwidth=0,
+                                            selectbackground=DL_COLORS["highlight_blue"], selectforeground=DL_COLORS["text_light"], highlightthickness=0)
+        self.facet_domain_listbox.pack(fill=tk.BOTH, expand=True)
+        self.facet_domain_listbox.bind('<<ListboxSelect>>', lambda event: self.on_facet_select(event, 'domain'))
+
         columns = ('Title', 'Login', 'Type')
         self.item_treeview = ttk.Treeview(treeview_frame, columns=columns, show='headings')
 
@@ -393,6 +2022,8 @@ class App(tk.Tk):
         treeview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         self.item_treeview.bind('<<TreeviewSelect>>', self.on_item_select_from_list)
+        for key_name, direction in (('<Up>', -1), ('<Prior>', -1), ('<Down>', 1), ('<Next>', 1)):
+            self.item_treeview.bind(key_name, lambda event, direction=direction: setattr(self, '_selection_direction', direction), add='+')
         self.item_treeview.bind('<Double-1>', lambda event: self.view_selected_item_details())
 
         action_buttons_frame = ttk.Frame(self.main_gui_frame, style='MainContent.TFrame')
@@ -401,12 +2032,142 @@ class App(tk.Tk):
         self.btn_view_details = ttk.Button(action_buttons_frame, text="View Details", command=self.view_selected_item_details, state=tk.DISABLED)
         self.btn_view_details.pack(side=tk.LEFT, padx=5)
 
-        self.btn_refresh_list = ttk.Button(action_buttons_frame, text="Refresh List", command=lambda: threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("",), daemon=True).start())
+        self.btn_refresh_list = ttk.Button(action_buttons_frame, text="Refresh List", command=lambda: threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("", self.active_profile), daemon=True).start())
         self.btn_refresh_list.pack(side=tk.LEFT, padx=5)
 
+        self.btn_sync = ttk.Button(action_buttons_frame, text="Sync", command=self.request_background_sync)
+        self.btn_sync.pack(side=tk.LEFT, padx=5)
+
         # Removed status_label packing from here, it's now packed in __init__
         self.update_status("Main GUI loaded. Attempting to load items...", 'info')
-        threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("",), daemon=True).start()
+        # Every profile loads concurrently in the background so switching later needs no reload
+        for profile in self.profiles.values():
+            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("", profile), daemon=True, name=f"Load-{profile.name}").start()
+
+        if self.app_config['SETTINGS'].getboolean('query_socket_enabled', fallback=False):
+            self.start_query_server()
+        self.schedule_auto_sync()
+
+
+    def apply_item_cache_budget(self):
+        """Applies the configured full-record cache budget, which each profile's item store gets in full."""
+        try:
+            budget_mb = int(self.app_config['SETTINGS'].get('item_cache_mb', str(_ITEM_CACHE_DEFAULT_MB)))
+        except ValueError:
+            budget_mb = _ITEM_CACHE_DEFAULT_MB
+        for profile in self.profiles.values():
+            profile.item_store.set_budget(max(budget_mb, 0) * 1024 * 1024)
+
+    def iter_full_records(self, items, item_profiles):
+        """
+        Full records of displayed items, in order, each rehydrated through the item store of its profile in
+        `item_profiles` (resolved on the Tk thread, so switching profile meanwhile doesn't change the mapping).
+        """
+        profile_items = {}
+        for item, profile in zip(items, item_profiles):
+            profile_items.setdefault(profile.name, (profile, []))[1].append(item)
+        profile_records = {name: profile.item_store.iter_records(grouped) for name, (profile, grouped) in profile_items.items()}
+        for profile in item_profiles:
+            yield next(profile_records[profile.name])
+
+    def ingest_in_worker(self, stdout_data):
+        """Decodes a large full-load payload in the ingestion worker process; returns None to decode it in-process instead."""
+        if len(stdout_data) < _INGEST_WORKER_MIN_BYTES or not self.app_config['SETTINGS'].getboolean('ingest_worker_enabled', fallback=True):
+            return None
+        try:
+            return self.ingest_worker.ingest(stdout_data.encode('utf-8', errors='surrogatepass'))
+        except (OSError, EOFError, RuntimeError) as e:
+            logging.warning(f"Ingestion worker unavailable ({e}); decoding the payload in-process instead.")
+            return None
+
+    def request_background_sync(self, profile=None):
+        """Syncs a profile in the background; clicks while a sync is running join the in-flight one."""
+        profile = profile or self.active_profile
+        started = profile.sync_manager.request_sync(
+            on_complete=lambda result: self.after(0, lambda: self.on_background_sync_complete(profile, result))
+        )
+        if started:
+            self.update_sync_progress(profile)
+        elif profile is self.active_profile:
+            self.update_status(f"Sync for '{profile.name}' already in progress...", 'info')
+
+    def update_sync_progress(self, profile):
+        sync_manager = profile.sync_manager
+        if not sync_manager.in_flight:
+            return
+        if profile is self.active_profile:
+            elapsed = time.monotonic() - sync_manager.started_at
+            self.update_status(f"Syncing '{profile.name}'... {elapsed:.0f}s (attempt {sync_manager.attempt}/{sync_manager.max_attempts})", 'info')
+        self.after(1000, lambda: self.update_sync_progress(profile))
+
+    def on_background_sync_complete(self, profile, result):
+        if result.ok:
+            self.update_status(f"Synced '{profile.name}' in {result.duration:.1f}s. Checking for changes...", 'info')
+            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("", profile, True), daemon=True).start()
+        elif result.auth_required and profile is self.active_profile:
+            self.handle_error_in_thread("Authentication Required", f"Background sync needs you to authenticate again:\n{result.message}", show_login_button=True)
+        else:
+            self.update_status(f"Sync for '{profile.name}' failed after {result.attempts} attempt(s): {result.message}", 'error')
+
+    def schedule_auto_sync(self):
+        """Re-arms the periodic background sync of every profile, if enabled in Settings."""
+        if self._auto_sync_id:
+            self.after_cancel(self._auto_sync_id)
+            self._auto_sync_id = None
+        try:
+            interval_minutes = int(self.app_config['SETTINGS'].get('auto_sync_minutes', '0'))
+        except ValueError:
+            interval_minutes = 0
+        if interval_minutes <= 0:
+            return
+
+        def run_auto_sync():
+            self._auto_sync_id = None
+            for profile in self.profiles.values():
+                if profile.vault_index is not None:
+                    self.request_background_sync(profile)
+            self.schedule_auto_sync()
+        self._auto_sync_id = self.after(interval_minutes * 60 * 1000, run_auto_sync)
+
+    def start_query_server(self):
+        """Exposes the in-memory vault to local scripts over a permission-restricted Unix socket."""
+        if self.query_server:
+            return True
+        socket_path = self.app_config['SETTINGS'].get('query_socket_path', '').strip() or _QUERY_SOCKET_DEFAULT_PATH
+        server = LocalQueryServer(self.search_for_query_server, os.path.expanduser(socket_path))
+        try:
+            server.start()
+        except OSError as e:
+            logging.error(f"Could not start local query socket at {socket_path}: {e}")
+            self.update_status(f"Local query socket unavailable: {e}", 'warn')
+            return False
+        self.query_server = server
+        self.update_status(f"Local query socket listening on {server.socket_path}", 'info')
+        return True
+
+    def search_for_query_server(self, search_term, profile_name=None):
+        """
+        Searches on behalf of the query socket: the active profile by default, a named profile,
+        or '*' for ranked results merged across all loaded profiles. Runs on socket threads.
+        Returns (profile_name, item) pairs, or None if nothing is loaded yet.
+        """
+        if profile_name == '*':
+            profile_results = []
+            for profile in list(self.profiles.values()):
+                results = profile.search(search_term)
+                if results is not None:
+                    profile_results.append((profile.name, results))
+            if not profile_results:
+                return None
+            return merge_ranked_results(profile_results, parse_query(search_term))
+        profile = self.profiles[profile_name] if profile_name else self.active_profile
+        results = profile.search(search_term)
+        return None if results is None else [(profile.name, item) for item in results]
+
+    def stop_query_server(self):
+        if self.query_server:
+            self.query_server.stop()
+            self.query_server = None
 
 
     def copy_to_clipboard(self, text, button_widget=None, original_text=None, is_sensitive=True):
@@ -419,10 +2180,22 @@ class App(tk.Tk):
             logging.info(f"Copied text to clipboard: '{text[:50]}{'...' if len(text) > 50 else ''}'")
 
         if button_widget and original_text:
+            self.cancel_copy_restore(button_widget)
             button_widget.config(text="Copied!", state=tk.DISABLED)
-            self.after(1500, lambda: button_widget.config(text=original_text, state=tk.NORMAL))
+            self._copy_restore_ids[button_widget] = self.after(1500, lambda: self.restore_copy_button(button_widget, original_text))
         self.start_clipboard_countdown()
 
+    def restore_copy_button(self, button_widget, original_text):
+        self._copy_restore_ids.pop(button_widget, None)
+        if button_widget.winfo_exists():
+            button_widget.config(text=original_text, state=tk.NORMAL)
+
+    def cancel_copy_restore(self, button_widget):
+        """Drops a pending "Copied!" restore, e.g. when the details window is relabelled for another item."""
+        after_id = self._copy_restore_ids.pop(button_widget, None)
+        if after_id:
+            self.after_cancel(after_id)
+
     def launch_terminal_command(self, command_parts):
         system = platform.system()
         try:
@@ -450,7 +2223,23 @@ class App(tk.Tk):
             logging.error(f"Failed to launch terminal command: {e}")
             return False
 
+    def schedule_search_history(self, term):
+        """Records a search once typing pauses, so prefixes typed on the way don't fill the history or rewrite config.ini per keystroke."""
+        if self._search_history_id:
+            self.after_cancel(self._search_history_id)
+            self._search_history_id = None
+        if term:
+            self._search_history_id = self.after(_SEARCH_HISTORY_IDLE_MS, lambda: self.add_to_search_history(term))
+
+    def on_search_committed(self, event=None):
+        """Enter or a pick from the history list: search and record the term right away."""
+        self.filter_treeview_items(record_history=False)
+        if self._search_history_id:
+            self.after_cancel(self._search_history_id)
+        self.add_to_search_history(self.entry_site_name_var.get())
+
     def add_to_search_history(self, term):
+        self._search_history_id = None
         term = term.strip()
         if not term: return
 
@@ -458,12 +2247,13 @@ class App(tk.Tk):
             self.SEARCH_HISTORY.remove(term)
         self.SEARCH_HISTORY.insert(0, term)
         self.SEARCH_HISTORY = self.SEARCH_HISTORY[:self.MAX_SEARCH_HISTORY]
+        self.active_profile.search_history = self.SEARCH_HISTORY
 
         if hasattr(self, 'entry_site_name') and self.entry_site_name.winfo_exists():
             self.entry_site_name['values'] = self.SEARCH_HISTORY
 
         try:
-            self.app_config['SETTINGS']['search_history'] = json.dumps(self.SEARCH_HISTORY)
+            self.app_config[self.active_profile.config_section]['search_history'] = json.dumps(self.SEARCH_HISTORY)
             with open(self.CONFIG_FILE, 'w') as f:
                 self.app_config.write(f)
             logging.info(f"Search history updated with '{term}'.")
@@ -471,65 +2261,136 @@ class App(tk.Tk):
             logging.error(f"Failed to save search history: {e}")
 
 
-    def display_password_details_window(self, item_title, item_login, password):
+    def _build_details_window(self):
         details_window = Toplevel(self)
-        details_window.title(f"Details for {item_title}")
+        details_window.withdraw() # Shown by display_password_details_window once it has an item
         details_window.transient(self)
-        details_window.grab_set()
 
         details_window.config(bg=DL_COLORS["dark_accent"])
         content_frame = ttk.Frame(details_window, padding="15 15 15 15", style='DarkAccent.TFrame')
         content_frame.pack(fill=tk.BOTH, expand=True)
 
         ttk.Label(content_frame, text="Title:", font=('Arial', 10, 'bold'), style='DarkAccent.TLabel').grid(row=0, column=0, sticky=tk.W, pady=2)
-        ttk.Label(content_frame, text=item_title, wraplength=300, style='DarkAccent.TLabel').grid(row=0, column=1, sticky=tk.W, pady=2)
+        title_label = ttk.Label(content_frame, wraplength=300, style='DarkAccent.TLabel')
+        title_label.grid(row=0, column=1, sticky=tk.W, pady=2)
 
         ttk.Label(content_frame, text="Login:", font=('Arial', 10, 'bold'), style='DarkAccent.TLabel').grid(row=1, column=0, sticky=tk.W, pady=2)
-        ttk.Label(content_frame, text=item_login, wraplength=300, style='DarkAccent.TLabel').grid(row=1, column=1, sticky=tk.W, pady=2)
+        login_label = ttk.Label(content_frame, wraplength=300, style='DarkAccent.TLabel')
+        login_label.grid(row=1, column=1, sticky=tk.W, pady=2)
 
         ttk.Label(content_frame, text="Password:", font=('Arial', 10, 'bold'), style='DarkAccent.TLabel').grid(row=2, column=0, sticky=tk.W, pady=2)
 
-        actual_password_text = password
-        show_password_var = tk.BooleanVar(value=False)
+        self.details_show_password_var = tk.BooleanVar(value=False)
 
         password_display = ttk.Label(content_frame, text="*", wraplength=300, style='DarkAccent.TLabel')
         password_display.grid(row=2, column=1, sticky=tk.W, pady=2)
 
-        def update_password_display_label():
-            if show_password_var.get():
-                password_display.config(text=actual_password_text)
-            else:
-                password_display.config(text="*" * len(actual_password_text))
-
         btn_toggle_password_visibility = ttk.Checkbutton(
-            content_frame, text="Show Password", variable=show_password_var, command=update_password_display_label,
+            content_frame, text="Show Password", variable=self.details_show_password_var, command=self.update_details_password_label,
             onvalue=True, offvalue=False, style='PasswordToggle.TCheckbutton'
         )
         btn_toggle_password_visibility.grid(row=2, column=2, padx=5, sticky=tk.W)
-        update_password_display_label()
 
         button_frame = ttk.Frame(content_frame, style='DarkAccent.TFrame')
         button_frame.grid(row=3, column=0, columnspan=3, pady=15)
 
+        # The copy buttons read the item on display when clicked, so they survive relabelling
         btn_copy_password = ttk.Button(button_frame, text="Copy Password")
-        btn_copy_password.config(command=lambda: self.copy_to_clipboard(password, btn_copy_password, "Copy Password", is_sensitive=True))
+        btn_copy_password.config(command=lambda: self.copy_to_clipboard(self._details_item[2], btn_copy_password, "Copy Password", is_sensitive=True))
         btn_copy_password.pack(side=tk.LEFT, padx=5)
 
         btn_copy_login = ttk.Button(button_frame, text="Copy Login")
-        btn_copy_login.config(command=lambda: self.copy_to_clipboard(item_login, btn_copy_login, "Copy Login", is_sensitive=True))
+        btn_copy_login.config(command=lambda: self.copy_to_clipboard(self._details_item[1], btn_copy_login, "Copy Login", is_sensitive=True))
         btn_copy_login.pack(side=tk.LEFT, padx=5)
 
         btn_copy_both = ttk.Button(button_frame, text="Copy Both")
-        btn_copy_both.config(command=lambda: self.copy_to_clipboard(f"{item_login}:{password}", btn_copy_both, "Copy Both", is_sensitive=True))
+        btn_copy_both.config(command=lambda: self.copy_to_clipboard(f"{self._details_item[1]}:{self._details_item[2]}", btn_copy_both, "Copy Both", is_sensitive=True))
         btn_copy_both.pack(side=tk.LEFT, padx=5)
 
-        ttk.Button(content_frame, text="Close", command=details_window.destroy).grid(row=4, column=0, columnspan=3, pady=5)
+        ttk.Button(content_frame, text="Close", command=self.hide_details_window).grid(row=4, column=0, columnspan=3, pady=5)
+        ttk.Label(content_frame, text="Up/Down: previous/next item, Esc: close", style='DarkAccent.TLabel').grid(row=5, column=0, columnspan=3, pady=(5, 0))
+
+        details_window.protocol("WM_DELETE_WINDOW", self.hide_details_window)
+        details_window.bind("<Escape>", lambda e: self.hide_details_window())
+        details_window.bind("<Up>", lambda e: self.step_details(-1))
+        details_window.bind("<Down>", lambda e: self.step_details(1))
+
+        self.details_window = details_window
+        self._details_widgets = {
+            'title': title_label,
+            'login': login_label,
+            'password': password_display,
+            'copy_password': btn_copy_password,
+            'copy_both': btn_copy_both
+        }
+
+    def display_password_details_window(self, item_title, item_login, password):
+        """
+        Shows an item in the details window. The window is built once and only relabelled afterwards;
+        closing it withdraws it, so opening or stepping to another item rebuilds nothing.
+        """
+        if self.details_window is None or not self.details_window.winfo_exists():
+            self._build_details_window()
+        self._details_item = (item_title, item_login, password or '')
+
+        self.details_window.title(f"Details for {item_title}")
+        self._details_widgets['title'].config(text=item_title)
+        self._details_widgets['login'].config(text=item_login)
+        self.details_show_password_var.set(False)
+        self.update_details_password_label()
+        copy_password_state = tk.NORMAL if password else tk.DISABLED
+        for button_name in ('copy_password', 'copy_both'):
+            self.cancel_copy_restore(self._details_widgets[button_name]) # Its restore would re-enable it for a password-less item
+        self._details_widgets['copy_password'].config(text="Copy Password", state=copy_password_state)
+        self._details_widgets['copy_both'].config(text="Copy Both", state=copy_password_state)
+
+        if not self.is_details_window_open():
+            self.details_window.deiconify()
+            self.details_window.grab_set()
+        self.details_window.lift()
+        self.details_window.focus_set()
+        self.btn_view_details.config(state=tk.DISABLED)
 
-        details_window.protocol("WM_DELETE_WINDOW", lambda: details_window.destroy())
         logging.info(f"Opened password details window for '{item_title}'.")
-        self.update_status("Password details displayed.", 'info')
+        if password:
+            self.update_status("Password details displayed.", 'info')
 
-        details_window.bind("<Destroy>", lambda e: self.btn_view_details.config(state=tk.NORMAL))
+    def update_details_password_label(self):
+        password = self._details_item[2]
+        if self.details_show_password_var.get():
+            self._details_widgets['password'].config(text=password)
+        else:
+            self._details_widgets['password'].config(text="*" * len(password))
+
+    def is_details_window_open(self):
+        return self.details_window is not None and self.details_window.winfo_exists() and self.details_window.state() != 'withdrawn'
+
+    def hide_details_window(self):
+        if not self.is_details_window_open():
+            return
+        self.details_window.grab_release()
+        self.details_window.withdraw()
+        self._details_item = ('', '', '') # Don't keep the secret around in the hidden window
+        self.details_show_password_var.set(False)
+        self.update_details_password_label()
+        self.btn_view_details.config(state=tk.NORMAL if self.item_treeview.selection() else tk.DISABLED)
+        self.item_treeview.focus_set()
+
+    def step_details(self, direction):
+        """Moves the list selection to the previous/next row and shows it in the open details window."""
+        selection = self.item_treeview.selection()
+        children = self.item_treeview.get_children()
+        if not selection or not children:
+            return
+        position = self.item_treeview.index(selection[0]) + direction
+        if not 0 <= position < len(children):
+            self.bell()
+            return
+        self._selection_direction = direction
+        self.item_treeview.selection_set(children[position])
+        self.item_treeview.focus(children[position])
+        self.item_treeview.see(children[position])
+        self.view_selected_item_details()
 
 
     def clear_clipboard(self):
@@ -588,12 +2449,47 @@ class App(tk.Tk):
 
     def on_item_select_from_list(self, event):
         selected_item_iid = self.item_treeview.selection()
-        if selected_item_iid:
+        if selected_item_iid and self.is_details_window_open():
+            self.prefetch_around_selection(selected_item_iid[0]) # Stepping through the details window
+        elif selected_item_iid:
             self.btn_view_details.config(state=tk.NORMAL)
             self.update_status("Item selected. Click 'View Details' or double-click.", 'info')
+            self.prefetch_around_selection(selected_item_iid[0])
         else:
             self.btn_view_details.config(state=tk.DISABLED)
 
+    def get_displayed_item_profile(self, item):
+        profile_name = self._displayed_item_profiles.get(id(item))
+        return self.profiles[profile_name] if profile_name else self.active_profile
+
+    def prefetch_around_selection(self, item_iid, lookahead=3):
+        """Prefetches details for the selected row, the next rows in the direction of travel and the previous one."""
+        selected_index_tag = self.item_treeview.item(item_iid, 'tag')
+        if not selected_index_tag or not selected_index_tag[0].isdigit():
+            return
+        index = int(selected_index_tag[0])
+        offsets = [0] + [self._selection_direction * step for step in range(1, lookahead + 1)] + [-self._selection_direction]
+        requests = []
+        for offset in offsets:
+            position = index + offset
+            if 0 <= position < len(self.CURRENTLY_DISPLAYED_ITEMS):
+                item = self.CURRENTLY_DISPLAYED_ITEMS[position]
+                requests.append((self.get_displayed_item_profile(item), item))
+        self.details_prefetcher.prefetch(requests)
+
+    def get_selected_displayed_item(self):
+        """Returns the CURRENTLY_DISPLAYED_ITEMS entry for the selected row, or None."""
+        selected_item_iid = self.item_treeview.selection()
+        if not selected_item_iid:
+            return None
+        selected_index_tag = self.item_treeview.item(selected_item_iid[0], 'tag')
+        if not selected_index_tag or not selected_index_tag[0].isdigit():
+            return None
+        position = int(selected_index_tag[0])
+        if position >= len(self.CURRENTLY_DISPLAYED_ITEMS):
+            return None
+        return self.CURRENTLY_DISPLAYED_ITEMS[position]
+
     def view_selected_item_details(self):
         selected_item_iid = self.item_treeview.selection()
         if not selected_item_iid:
@@ -604,37 +2500,63 @@ class App(tk.Tk):
         selected_index_tag = self.item_treeview.item(selected_item_iid[0], 'tag')
         if selected_index_tag and selected_index_tag[0].isdigit():
             try:
-                actual_item_data = self.CURRENTLY_DISPLAYED_ITEMS[int(selected_index_tag[0])]
-                item_title = actual_item_data.get('title', 'N/A')
-                item_login = actual_item_data.get('login', 'N/A')
-                password = actual_item_data.get('password')
-
-                if not password:
-                    specific_message = f"The selected item '{item_title}' (Login: {item_login}) does not contain a 'password' field."
-                    if actual_item_data.get('note'):
-                        specific_message = f"'{item_title}' is a Secure Note. No password to display."
-                    elif actual_item_data.get('firstName') or actual_item_data.get('lastName'):
-                        specific_message = f"'{item_title}' is a Personal Info item. No password to display."
-                    elif actual_item_data.get('address1') or actual_item_data.get('city'):
-                        specific_message = f"'{item_title}' is an Address item. No password to display."
-                    elif actual_item_data.get('website'):
-                        specific_message = f"'{item_title}' is a Website item (no login/password detected)."
-
-                    self.handle_error_in_thread("Password Not Found", specific_message, 'warn')
-                    return
-
-                self.display_password_details_window(item_title, item_login, password)
-                self.btn_view_details.config(state=tk.DISABLED)
-
+                selected_item = self.CURRENTLY_DISPLAYED_ITEMS[int(selected_index_tag[0])]
             except IndexError:
                 logging.error(f"Could not retrieve full item data for selected item_iid: {selected_item_iid}. Index {selected_index_tag} out of bounds in CURRENTLY_DISPLAYED_ITEMS.")
                 self.handle_error_in_thread("Data Error", "Could not retrieve full item details. Please try again or refresh list.")
-            except Exception as e:
-                logging.error(f"Error viewing item details: {e}")
-                self.handle_error_in_thread("Error", f"Failed to view item details: {str(e)}")
+                return
+            self.btn_view_details.config(state=tk.DISABLED)
+            self.update_status("Loading item details...", 'info')
+            self._details_request_seq += 1
+            request_seq = self._details_request_seq
+            self.details_prefetcher.get(
+                self.get_displayed_item_profile(selected_item), selected_item,
+                lambda details, error: self.after(0, lambda: self.show_item_details(details, error, request_seq, selected_item))
+            )
         else:
             self.update_status("No item selected.", 'warn')
 
+    def show_item_details(self, actual_item_data, error=None, request_seq=None, requested_item=None):
+        if request_seq is not None and (request_seq != self._details_request_seq or requested_item is not self.get_selected_displayed_item()):
+            # A slower load for a row the user has already stepped past; the newer request relabels the window
+            logging.debug(f"Dropping stale details result for request {request_seq} (current {self._details_request_seq}).")
+            if request_seq == self._details_request_seq and not self.is_details_window_open():
+                self.btn_view_details.config(state=tk.NORMAL if self.item_treeview.selection() else tk.DISABLED)
+            return
+        if error is not None:
+            logging.error(f"Error loading item details: {error}")
+            self.handle_error_in_thread("Error", f"Failed to load item details: {str(error)}")
+            return
+        try:
+            item_title = actual_item_data.get('title', 'N/A')
+            item_login = actual_item_data.get('login', 'N/A')
+            password = actual_item_data.get('password')
+
+            if not password:
+                specific_message = f"The selected item '{item_title}' (Login: {item_login}) does not contain a 'password' field."
+                if actual_item_data.get('note'):
+                    specific_message = f"'{item_title}' is a Secure Note. No password to display."
+                elif actual_item_data.get('firstName') or actual_item_data.get('lastName'):
+                    specific_message = f"'{item_title}' is a Personal Info item. No password to display."
+                elif actual_item_data.get('address1') or actual_item_data.get('city'):
+                    specific_message = f"'{item_title}' is an Address item. No password to display."
+                elif actual_item_data.get('website'):
+                    specific_message = f"'{item_title}' is a Website item (no login/password detected)."
+
+                if self.is_details_window_open():
+                    # Stepping through results: show the item without interrupting with a dialog
+                    self.display_password_details_window(item_title, item_login, None)
+                    self.update_status(specific_message, 'warn')
+                    return
+                self.handle_error_in_thread("Password Not Found", specific_message, 'warn')
+                return
+
+            self.display_password_details_window(item_title, item_login, password)
+
+        except Exception as e:
+            logging.error(f"Error viewing item details: {e}")
+            self.handle_error_in_thread("Error", f"Failed to view item details: {str(e)}")
+
 
     def treeview_sort_column(self, col_id):
         """Sort a Treeview column when a header is clicked."""
@@ -647,33 +2569,36 @@ class App(tk.Tk):
             elif col_id == 'Login':
                 return item.get('login', '').lower()
             elif col_id == 'Type':
-                if not item.get('password'):
-                    if item.get('note') is not None and item.get('note') != '': return "Secure Note"
-                    elif any(key in item for key in ['firstName', 'lastName', 'birthDate', 'gender']): return "PersonalInfo"
-                    elif any(key in item for key in ['address1', 'city', 'zipCode', 'country']): return "Address"
-                    elif any(key in item for key in ['cardHolderName', 'cardNumber']): return "Credit Card"
-                    elif any(key in item for key in ['licenseNumber', 'stateOfIssue']): return "ID"
-                    elif item.get('website'): return "Website Only"
-                    else: return "Other"
-                return "Login"
+                return get_item_type(item)
             return ''
 
         sorted_items = sorted(self.CURRENTLY_DISPLAYED_ITEMS, key=get_sort_value, reverse=reverse_sort)
 
         self._treeview_sort_orders[col_id] = reverse_sort
 
-        self.populate_treeview(sorted_items)
+        self.populate_treeview(sorted_items, self._displayed_item_profiles)
 
         sort_direction = "Descending" if reverse_sort else "Ascending"
         self.update_status(f"Sorted by {col_id} ({sort_direction}).", 'info')
         logging.info(f"Treeview sorted by {col_id} in {sort_direction} order.")
 
 
-    def run_dcli_command_and_populate_treeview(self, search_term=""):
+    def run_dcli_command_and_populate_treeview(self, search_term="", profile=None, only_if_changed=False):
         """
         Executes dcli password list with a specific search term or a broad filter for initial load.
-        Populates Treeview with the results.
+        Populates Treeview with the results when `profile` (default: the active one) is being displayed.
+        With only_if_changed (after a sync), a full load whose output is identical to the last one is discarded.
         """
+        profile = profile or self.active_profile
+
+        def report_error(title, message, level='error', show_login_button=False):
+            # Background profiles report in the status bar instead of interrupting with dialogs
+            if profile is self.active_profile:
+                self.handle_error_in_thread(title, message, level, show_login_button)
+            else:
+                logging.error(f"Profile '{profile.name}': {title} - {message}")
+                self.update_status(f"Profile '{profile.name}' failed to load: {title}.", 'warn')
+
         if self._countdown_id:
             self.after_cancel(self._countdown_id)
             self._countdown_id = None
@@ -687,12 +2612,23 @@ class App(tk.Tk):
         if search_term:
             command.append(search_term)
         else:
-            broad_filters = list(string.ascii_lowercase) + list(string.digits)
-            broad_filters.extend(['æ', 'ø', 'å', 'é', 'à', 'ç'])
-            command.extend(broad_filters)
+            command.extend(_DCLI_BROAD_FILTERS)
 
         command.extend(["--output", "json"])
 
+        frame_probe = None
+        ingest_mode = "decoded in-process"
+        if not search_term:
+            profile.loading = True
+            # Full loads log main-loop frame times, to compare ingestion with and without the worker process
+            frame_probe = MainLoopProbe(self)
+            self.after(0, frame_probe.start)
+
+        def finish_frame_probe():
+            summary = frame_probe.stop()
+            if summary:
+                logging.info(f"Main loop frame times during the full load of '{profile.name}' ({ingest_mode}): {summary}")
+
         try:
             # For `password list`, we still capture output to parse JSON
             process = subprocess.Popen(
@@ -701,7 +2637,8 @@ class App(tk.Tk):
                 stderr=subprocess.PIPE,
                 encoding='utf-8',
                 errors='ignore',
-                shell=True # Keep shell=True for broad filters for now, although generally not recommended
+                shell=True, # Keep shell=True for broad filters for now, although generally not recommended
+                env=profile.dcli_env()
             )
             stdout_data, stderr_data = process.communicate(timeout=30) # Added timeout
 
@@ -712,7 +2649,7 @@ class App(tk.Tk):
                 logging.error(f"dcli STDERR (command: {' '.join(command)}):\n{stderr_data.strip()}")
                 error_message = f"dcli command failed with exit code {process.returncode}:\n{stderr_data.strip()}"
                 if "authentication required" in stderr_data.lower() or "not logged in" in stderr_data.lower():
-                    self.after(0, lambda: self.handle_error_in_thread(
+                    self.after(0, lambda: report_error(
                         "Authentication Required",
                         "dcli is not authenticated. Please ensure you have an active `dcli` session. "
                         "You may need to interact with the Dashlane desktop app or browser extension "
@@ -720,90 +2657,252 @@ class App(tk.Tk):
                         show_login_button=True
                     ))
                 elif "2fa" in stderr_data.lower() or "two-factor" in stderr_data.lower():
-                    self.after(0, lambda: self.handle_error_in_thread(
+                    self.after(0, lambda: report_error(
                         "2FA Required",
                         "dcli is asking for your 2FA code. Please authenticate in the terminal.",
                         show_login_button=True
                     ))
                 else:
-                    self.after(0, lambda: self.handle_error_in_thread("dcli Error", error_message))
+                    self.after(0, lambda: report_error("dcli Error", error_message))
                 return
 
+            if not search_term:
+                payload_digest = hashlib.sha256(stdout_data.encode('utf-8', errors='ignore')).digest()
+                if only_if_changed and payload_digest == profile.payload_digest:
+                    ingest_mode = "unchanged, not decoded"
+                    logging.info(f"Profile '{profile.name}': vault unchanged after sync; keeping index and caches.")
+                    self.after(0, lambda: self.update_status(f"Sync complete for '{profile.name}': no changes.", 'info'))
+                    return
+
             try:
-                items = json.loads(stdout_data)
+                ingested = self.ingest_in_worker(stdout_data) if not search_term else None
+                if ingested is not None:
+                    ingest_mode = "decoded in worker process"
+                    unique_items_list = ingested
+                else:
+                    items = json.loads(stdout_data)
 
-                unique_items_map = {}
-                for item in items:
-                    item_id = item.get('id')
-                    if item_id:
-                        unique_items_map[item_id] = item
-                    else:
-                        unique_key = (item.get('title', ''), item.get('login', ''), item.get('note', ''))
-                        unique_items_map[unique_key] = item
+                    unique_items_map = {}
+                    for item in items:
+                        unique_items_map[get_item_key(item)] = item
 
-                unique_items_list = list(unique_items_map.values())
+                    unique_items_list = list(unique_items_map.values())
 
                 logging.info(f"Command '{' '.join(command)}' successfully returned {len(unique_items_list)} unique items (output not logged).")
 
-                self.after(0, lambda: self.populate_treeview(unique_items_list))
-                self.after(0, lambda: self.update_status(f"Loaded {len(unique_items_list)} items. Ready.", 'info'))
+                if not search_term:
+                    profile.payload_digest = payload_digest
+                    profile.set_vault_items(unique_items_list)
+                    self.after(0, finish_frame_probe) # Before the treeview is repopulated, which is measured separately
+                    self.after(0, lambda: self.on_profile_loaded(profile))
+                elif profile is self.active_profile:
+                    self.after(0, lambda: self.populate_treeview(unique_items_list))
+                    self.after(0, lambda: self.update_status(f"Loaded {len(unique_items_list)} items. Ready.", 'info'))
 
             except json.JSONDecodeError as e:
                 output_snippet = stdout_data.strip()[:500] + "..." if len(stdout_data.strip()) > 500 else stdout_data.strip()
                 sensitive_warning = " (WARNING: This output may contain sensitive data and is being logged for debugging JSON errors.)" if "password list" in " ".join(command) else ""
                 error_message = f"dcli command did not return valid JSON. Error: {e}\nOutput (snippet){sensitive_warning}:\n{output_snippet}\nError:\n{stderr_data.strip()}"
                 logging.error(error_message)
-                self.after(0, lambda: self.handle_error_in_thread("JSON Decode Error", error_message))
+                self.after(0, lambda: report_error("JSON Decode Error", error_message))
             except Exception as json_e:
                 error_message = f"Error processing dcli JSON output: {str(json_e)}\nOutput:\n{stdout_data.strip()}"
-                self.after(0, lambda: self.handle_error_in_thread("JSON Processing Error", error_message))
+                self.after(0, lambda: report_error("JSON Processing Error", error_message))
 
         except FileNotFoundError:
             error_message = "dcli not found. Make sure it's in your PATH."
-            self.after(0, lambda: self.handle_error_in_thread("Error", error_message, 'error', show_login_button=True))
+            self.after(0, lambda: report_error("Error", error_message, 'error', show_login_button=True))
         except TimeoutExpired as e:
             logging.error(f"dcli password list command timed out: {e}")
-            self.after(0, lambda: self.handle_error_in_thread("Command Timed Out", "Dashlane CLI command took too long to respond. This might indicate an issue with dcli or it waiting for an unexpected input. Please try again, or check your terminal.", 'error', show_login_button=True))
+            self.after(0, lambda: report_error("Command Timed Out", "Dashlane CLI command took too long to respond. This might indicate an issue with dcli or it waiting for an unexpected input. Please try again, or check your terminal.", 'error', show_login_button=True))
         except Exception as e:
             error_message = f"An unexpected error occurred: {str(e)}"
-            self.after(0, lambda: self.handle_error_in_thread("An unexpected error occurred", error_message, 'error'))
+            self.after(0, lambda: report_error("An unexpected error occurred", error_message, 'error'))
         finally:
+            if not search_term:
+                profile.loading = False
+                self.after(0, finish_frame_probe)
             self.after(0, lambda: self.btn_refresh_list.config(state=tk.NORMAL))
             self.after(0, lambda: self.btn_view_details.config(state=tk.NORMAL if self.item_treeview.selection() else tk.DISABLED))
 
 
-    def populate_treeview(self, items_to_display):
+    def on_profile_loaded(self, profile):
+        """Runs on the Tk loop after a profile's full load has replaced its in-memory vault."""
+        self.details_prefetcher.clear()
+        if profile is self.active_profile or self.search_all_profiles_var.get():
+            # Re-run whatever is in the search field against the new vault instead of resetting the view
+            self.filter_treeview_items(record_history=False)
+            if not self.entry_site_name_var.get().strip():
+                self.update_status(f"Loaded {len(profile.vault_items)} items. Ready.", 'info')
+        else:
+            self.update_status(f"Profile '{profile.name}' loaded {len(profile.vault_items)} items in the background.", 'info')
+
+    def switch_profile(self, profile_name):
+        """Shows another profile's already-loaded vault and search history without reloading."""
+        profile = self.profiles[profile_name]
+        if profile is self.active_profile:
+            return
+        self.active_profile = profile
+        self.SEARCH_HISTORY = profile.search_history
+        self.entry_site_name['values'] = self.SEARCH_HISTORY
+        self.app_config['SETTINGS']['active_profile'] = profile.name
+        logging.info(f"Switched to profile '{profile.name}'.")
+
+        if profile.vault_index is not None:
+            self.filter_treeview_items(record_history=False)
+            return
+        self.populate_treeview([])
+        self.update_facets([])
+        if profile.loading:
+            self.update_status(f"Profile '{profile.name}' is still loading...", 'info')
+        else:
+            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("", profile), daemon=True).start()
+
+    def update_facets(self, facet_counts_list):
+        """Shows the facet counts of the current view, one FacetCounts per profile in it."""
+        self.facet_counts = facet_counts_list[0] if len(facet_counts_list) == 1 else FacetCounts.combine(facet_counts_list)
+
+        if not hasattr(self, 'facet_type_listbox') or not self.facet_type_listbox.winfo_exists():
+            return
+        type_values = [name for name, _ in self.facet_counts.type_counts.most_common()]
+        domain_values = [name for name, _ in self.facet_counts.domain_counts.most_common(_MAX_DOMAIN_FACETS)]
+        labels = ([f"{value} ({self.facet_counts.type_counts[value]})" for value in type_values],
+                  [f"{value} ({self.facet_counts.domain_counts[value]})" for value in domain_values])
+        self._facet_type_values, self._facet_domain_values = type_values, domain_values
+        if labels == self._facet_labels:
+            return # Unchanged, e.g. a keystroke that didn't change the result set
+        self._facet_labels = labels
+        for listbox, listbox_labels in zip((self.facet_type_listbox, self.facet_domain_listbox), labels):
+            listbox.delete(0, tk.END)
+            listbox.insert(tk.END, *listbox_labels)
+
+    def on_facet_select(self, event, facet_kind):
+        """Clicking a facet toggles the matching type:/domain: filter in the search field."""
+        listbox = event.widget
+        selection = listbox.curselection()
+        if not selection:
+            return
+        listbox.selection_clear(0, tk.END)
+        if facet_kind == 'type':
+            filter_term = f"type:{self._facet_type_values[selection[0]].replace(' ', '').lower()}"
+        else:
+            filter_term = f"domain:{self._facet_domain_values[selection[0]]}"
+
+        terms = self.entry_site_name_var.get().split()
+        if filter_term in terms:
+            terms.remove(filter_term)
+        else:
+            terms.append(filter_term)
+        self.entry_site_name_var.set(' '.join(terms))
+        self.filter_treeview_items()
+
+    def populate_treeview(self, items_to_display, item_profiles=None):
         self.item_treeview.delete(*self.item_treeview.get_children())
         self.CURRENTLY_DISPLAYED_ITEMS = items_to_display
+        self._displayed_item_profiles = item_profiles or {}
 
         for i, item in enumerate(items_to_display):
             title = item.get('title', 'No Title')
+            if self._displayed_item_profiles:
+                title = f"[{self._displayed_item_profiles[id(item)]}] {title}"
             login = item.get('login', 'No Login')
 
-            item_type = "Login"
-            if not item.get('password'):
-                if item.get('note') is not None and item.get('note') != '': item_type = "Secure Note"
-                elif any(key in item for key in ['firstName', 'lastName', 'birthDate', 'gender']): item_type = "Personal Info"
-                elif any(key in item for key in ['address1', 'city', 'zipCode', 'country']): item_type = "Address"
-                elif any(key in item for key in ['cardHolderName', 'cardNumber']): item_type = "Credit Card"
-                elif any(key in item for key in ['licenseNumber', 'stateOfIssue']): item_type = "ID"
-                elif item.get('website'): item_type = "Website Only"
-                else: item_type = "Other"
+            item_type = get_item_type(item)
 
             tag = "oddrow" if i % 2 == 0 else "evenrow"
             self.item_treeview.insert("", tk.END, text="", values=(title, login, item_type), tags=(str(i), tag))
 
 
-    def filter_treeview_items(self, event=None):
+    def filter_treeview_items(self, event=None, record_history=True):
         search_term = self.entry_site_name_var.get().strip()
+        if record_history:
+            self.schedule_search_history(search_term)
+        self._search_seq += 1 # Supersedes a note: search that is still running
+        if self.search_all_profiles_var.get():
+            self.filter_all_profiles(search_term)
+            return
+
+        profile = self.active_profile
+        if profile.vault_index is not None:
+            # Vault already loaded: search it in memory instead of spawning dcli per keystroke
+            self.run_in_memory_search(search_term, lambda: profile.search_with_facets(search_term),
+                                      lambda result: self.show_profile_results(search_term, *result))
+            return
+
         if search_term:
-            self.add_to_search_history(search_term)
             self.update_status(f"Searching Dashlane CLI for '{search_term}'...", 'info')
-            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=(search_term,), daemon=True).start()
-        else:
-            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("",), daemon=True).start()
+            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=(search_term, profile), daemon=True).start()
+        elif not profile.loading:
+            threading.Thread(target=self.run_dcli_command_and_populate_treeview, args=("", profile), daemon=True).start()
             self.update_status("Attempting to load all accessible items.", 'info')
 
+    def run_in_memory_search(self, search_term, search, show):
+        """
+        Runs `search()` and passes its result to `show` on the Tk loop. note: terms need full records, which may be
+        rehydrated from the spill file or fetched from dcli, so such searches run on a worker thread once typing
+        pauses, and only the result of the latest search is shown.
+        """
+        if not any(term.field == 'note' for term in parse_query(search_term).terms):
+            show(search())
+            return
+        search_seq = self._search_seq
+
+        def show_if_current(result):
+            if search_seq == self._search_seq:
+                show(result)
+
+        def fail_if_current(error_message):
+            if search_seq == self._search_seq:
+                self.update_status(error_message, 'error')
+
+        def run_search():
+            try:
+                result = search()
+            except RuntimeError as e:
+                error_message = f"Could not search notes: {e}"
+                logging.error(f"Note search for '{search_term}' failed: {e}")
+                self.after(0, lambda: fail_if_current(error_message))
+                return
+            self.after(0, lambda: show_if_current(result))
+
+        def start_search():
+            if search_seq == self._search_seq: # Still the latest search after the typing pause
+                self.update_status(f"Searching notes for '{search_term}'...", 'info')
+                threading.Thread(target=run_search, daemon=True).start()
+
+        self.after(_NOTE_SEARCH_DEBOUNCE_MS, start_search)
+
+    def show_profile_results(self, search_term, vault_index, positions, facets):
+        results = [vault_index.items[i] for i in positions]
+        self.populate_treeview(results)
+        self.update_facets([facets])
+        self.update_status(f"Found {len(results)} items matching '{search_term}'." if search_term else f"Showing all {len(results)} items.", 'info')
+
+    def filter_all_profiles(self, search_term):
+        """Cross-profile search: ranked results from every loaded profile merged into one list."""
+        profiles = list(self.profiles.values())
+
+        def search():
+            profile_results = []
+            facet_sources = []
+            for profile in profiles:
+                vault_index, positions, facets = profile.search_with_facets(search_term)
+                if vault_index is None:
+                    continue
+                profile_results.append((profile.name, [vault_index.items[i] for i in positions]))
+                facet_sources.append(facets)
+            return profile_results, facet_sources
+
+        self.run_in_memory_search(search_term, search, lambda result: self.show_cross_profile_results(search_term, *result))
+
+    def show_cross_profile_results(self, search_term, profile_results, facet_sources):
+        merged = merge_ranked_results(profile_results, parse_query(search_term))
+        self.populate_treeview([item for _, item in merged], {id(item): profile_name for profile_name, item in merged})
+        self.update_facets(facet_sources)
+        pending = [profile.name for profile in self.profiles.values() if profile.vault_index is None]
+        pending_note = f" ({', '.join(pending)} still loading)" if pending else ""
+        self.update_status(f"Found {len(merged)} items across {len(profile_results)} profiles{pending_note}.", 'info')
+
 
     def clear_search_field(self):
         self.entry_site_name_var.set('')
@@ -811,6 +2910,175 @@ class App(tk.Tk):
         self.update_status("Search field cleared. Attempting to load all accessible items.", 'info')
         logging.info("Search field cleared.")
 
+    def export_current_view(self):
+        """Streams the currently displayed items to CSV or JSON from a background thread."""
+        items = self.CURRENTLY_DISPLAYED_ITEMS
+        if not items:
+            messagebox.showwarning("Nothing to Export", "There are no items in the current view to export.")
+            return
+        if self._export_cancel_event:
+            messagebox.showwarning("Export Running", "An export is already in progress.")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            parent=self, title="Export Current View", defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json")]
+        )
+        if not file_path:
+            return
+        export_format = 'json' if file_path.lower().endswith('.json') else 'csv'
+        include_secrets = messagebox.askyesno(
+            "Include Secrets?",
+            "Include passwords and secure notes in the export?\n\nThe file will contain them in plain text. "
+            "Choose 'No' to export titles, logins, websites and types only.",
+            default=messagebox.NO
+        )
+
+        cancel_event = threading.Event()
+        self._export_cancel_event = cancel_event
+        total = len(items)
+        item_profiles = [self.get_displayed_item_profile(item) for item in items] if include_secrets else None
+
+        def report_progress(rows_written):
+            self.after(0, lambda: self.update_status(f"Exporting... {rows_written}/{total} rows ({rows_written * 100 // total}%)", 'info'))
+
+        def run_export():
+            started = time.perf_counter()
+            try:
+                # Secrets live in the full records, which may have to be rehydrated from the item store
+                export_source = self.iter_full_records(items, item_profiles) if include_secrets else items
+                rows_written = export_items(export_source, file_path, export_format, include_secrets, report_progress, cancel_event)
+                if rows_written is None:
+                    self.after(0, lambda: self.update_status("Export cancelled.", 'warn'))
+                else:
+                    logging.info(f"Exported {rows_written} items as {export_format.upper()} (secrets included: {include_secrets}) in {time.perf_counter() - started:.2f}s.")
+                    self.after(0, lambda: self.update_status(f"Exported {rows_written} items to {os.path.basename(file_path)}.", 'info'))
+            except OSError as e:
+                error_message = f"Could not write {file_path}: {e}"
+                logging.error(f"Export to {file_path} failed: {e}")
+                self.after(0, lambda: self.handle_error_in_thread("Export Failed", error_message))
+            except RuntimeError as e:
+                error_message = f"Could not load the items to export: {e}"
+                logging.error(f"Export failed while loading full records: {e}")
+                self.after(0, lambda: self.handle_error_in_thread("Export Failed", error_message))
+            except Exception as e:
+                error_message = f"The export stopped unexpectedly: {e}"
+                logging.error(f"Export to {file_path} failed unexpectedly: {e}")
+                self.after(0, lambda: self.handle_error_in_thread("Export Failed", error_message))
+            finally:
+                self._export_cancel_event = None
+
+        self.update_status(f"Exporting {total} items...", 'info')
+        threading.Thread(target=run_export, daemon=True).start()
+
+    def open_audit_window(self):
+        """Audits the loaded vault on a background worker pool and lists the findings."""
+        profile = self.active_profile
+        vault_index = profile.vault_index
+        if vault_index is None:
+            messagebox.showwarning("Vault Not Loaded", "Please wait for the vault to finish loading before running an audit.")
+            return
+
+        audit_window = Toplevel(self)
+        audit_window.title(f"Vault Health Audit - {profile.name}")
+        audit_window.transient(self)
+        audit_window.config(bg=DL_COLORS["dark_accent"])
+        audit_window.geometry("700x450")
+
+        content_frame = ttk.Frame(audit_window, padding="15 15 15 15", style='DarkAccent.TFrame')
+        content_frame.pack(fill=tk.BOTH, expand=True)
+
+        summary_label = ttk.Label(content_frame, text=f"Auditing {len(vault_index.items)} items...", style='DarkAccent.TLabel', wraplength=650)
+        summary_label.pack(anchor=tk.W, pady=(0, 5))
+        progress_bar = ttk.Progressbar(content_frame, orient=tk.HORIZONTAL, mode='determinate', maximum=100)
+        progress_bar.pack(fill=tk.X, pady=(0, 10))
+
+        results_frame = ttk.Frame(content_frame, style='DarkAccent.TFrame')
+        results_frame.pack(fill=tk.BOTH, expand=True)
+        columns = ('Issue', 'Title', 'Login', 'Detail')
+        results_treeview = ttk.Treeview(results_frame, columns=columns, show='headings')
+        for col_id, width in zip(columns, (120, 180, 150, 220)):
+            results_treeview.heading(col_id, text=col_id, anchor=tk.W)
+            results_treeview.column(col_id, width=width, minwidth=80)
+        results_treeview.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=results_treeview.yview, style="Vertical.TScrollbar")
+        results_treeview.configure(yscrollcommand=results_scrollbar.set)
+        results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        cancel_event = threading.Event()
+        btn_cancel = ttk.Button(content_frame, text="Cancel", command=cancel_event.set)
+        btn_cancel.pack(pady=(10, 0))
+
+        def close_window():
+            cancel_event.set()
+            audit_window.destroy()
+
+        def show_findings(findings, elapsed):
+            if not audit_window.winfo_exists():
+                return
+            btn_cancel.config(text="Close", command=close_window)
+            if findings is None:
+                summary_label.config(text="Audit cancelled.")
+                self.update_status("Vault audit cancelled.", 'warn')
+                return
+            progress_bar['value'] = 100
+            issue_counts = Counter(finding.issue for finding in findings)
+            summary = ", ".join(f"{count} {issue}" for issue, count in sorted(issue_counts.items())) or "No issues found"
+            timing = "from cache" if elapsed is None else f"in {elapsed:.1f}s"
+            summary_label.config(text=f"Audited {len(vault_index.items)} items {timing}: {summary}.")
+            self.update_status(f"Vault audit finished: {summary}.", 'info')
+
+            sorted_findings = sorted(findings, key=lambda f: (f.issue, (f.item.get('title') or '').lower()))
+            def insert_batch(start=0):
+                # Insert rows in batches so large reports don't freeze the main loop
+                if not audit_window.winfo_exists():
+                    return
+                for finding in sorted_findings[start:start + 500]:
+                    results_treeview.insert("", tk.END, values=(finding.issue, finding.item.get('title', 'No Title'), finding.item.get('login', ''), finding.detail))
+                if start + 500 < len(sorted_findings):
+                    self.after(1, lambda: insert_batch(start + 500))
+            insert_batch()
+
+        def show_audit_error(message):
+            if audit_window.winfo_exists():
+                btn_cancel.config(text="Close", command=close_window)
+                summary_label.config(text=message)
+                self.update_status(message, 'error')
+
+        def report_progress(done, total):
+            self.after(0, lambda: audit_window.winfo_exists() and progress_bar.configure(value=done * 100 / total))
+
+        def run_audit():
+            started = time.perf_counter()
+            try:
+                # Passwords are only in the full records; they are held for the duration of the audit
+                full_records = profile.item_store.get_many(vault_index.items)
+            except RuntimeError as e:
+                error_message = f"Audit failed: {e}"
+                logging.error(f"Vault audit could not load full records: {e}")
+                self.after(0, lambda: show_audit_error(error_message))
+                return
+            # Findings point at the compact items, so the cached audit holds no passwords once the records are dropped
+            findings = VaultAuditor(full_records, progress_callback=report_progress, display_items=vault_index.items).run(cancel_event)
+            del full_records
+            elapsed = time.perf_counter() - started
+            if findings is not None:
+                profile.audit_cache = (vault_index, findings)
+                logging.info(f"Vault audit of {len(vault_index.items)} items finished in {elapsed:.2f}s with {len(findings)} findings.")
+            else:
+                logging.info("Vault audit cancelled.")
+            self.after(0, lambda: show_findings(findings, elapsed))
+
+        audit_window.protocol("WM_DELETE_WINDOW", close_window)
+        logging.info("Opened Vault Health Audit window.")
+
+        if profile.audit_cache and profile.audit_cache[0] is vault_index:
+            logging.info(f"Showing cached vault audit results for profile '{profile.name}'.")
+            show_findings(profile.audit_cache[1], None)
+            return
+        self.update_status("Running vault audit in the background...", 'info')
+        threading.Thread(target=run_audit, daemon=True).start()
+
     def show_about_window(self):
         about_window = Toplevel(self)
         about_window.title("About Dashlane CLI GUI")
@@ -854,12 +3122,36 @@ class App(tk.Tk):
         btn_clear_history = ttk.Button(content_frame, text="Clear Search History")
         btn_clear_history.grid(row=1, column=1, sticky=tk.EW, pady=5, padx=5)
 
+        query_socket_var = tk.BooleanVar(value=self.app_config['SETTINGS'].getboolean('query_socket_enabled', fallback=False))
+        ttk.Checkbutton(content_frame, text="Enable local query socket for scripts", variable=query_socket_var,
+                        onvalue=True, offvalue=False, style='PasswordToggle.TCheckbutton').grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5, padx=5)
+
+        ttk.Label(content_frame, text="Auto-sync every (minutes, 0 = off):", style='DarkAccent.TLabel').grid(row=3, column=0, sticky=tk.W, pady=5, padx=5)
+        auto_sync_var = tk.StringVar(value=self.app_config['SETTINGS'].get('auto_sync_minutes', '0'))
+        ttk.Entry(content_frame, textvariable=auto_sync_var, width=10).grid(row=3, column=1, sticky=tk.EW, pady=5, padx=5)
+
+        ttk.Label(content_frame, text="Full-record cache budget (MB):", style='DarkAccent.TLabel').grid(row=4, column=0, sticky=tk.W, pady=5, padx=5)
+        item_cache_var = tk.StringVar(value=self.app_config['SETTINGS'].get('item_cache_mb', str(_ITEM_CACHE_DEFAULT_MB)))
+        ttk.Entry(content_frame, textvariable=item_cache_var, width=10).grid(row=4, column=1, sticky=tk.EW, pady=5, padx=5)
+
+        ingest_worker_var = tk.BooleanVar(value=self.app_config['SETTINGS'].getboolean('ingest_worker_enabled', fallback=True))
+        ttk.Checkbutton(content_frame, text="Decode large vault refreshes in a separate process", variable=ingest_worker_var,
+                        onvalue=True, offvalue=False, style='PasswordToggle.TCheckbutton').grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=5, padx=5)
+
         def save_and_apply_settings():
             try:
                 new_delay = int(clipboard_delay_var.get())
                 if new_delay < 0:
                     messagebox.showwarning("Invalid Input", "Clipboard delay cannot be negative.")
                     return
+                new_auto_sync_minutes = int(auto_sync_var.get())
+                if new_auto_sync_minutes < 0:
+                    messagebox.showwarning("Invalid Input", "Auto-sync interval cannot be negative.")
+                    return
+                new_item_cache_mb = int(item_cache_var.get())
+                if new_item_cache_mb < 0:
+                    messagebox.showwarning("Invalid Input", "Cache budget cannot be negative.")
+                    return
 
                 self.app_config['SETTINGS']['clipboard_clear_delay_seconds'] = str(new_delay)
                 self.CLIPBOARD_CLEAR_DELAY_SECONDS = new_delay
@@ -869,6 +3161,19 @@ class App(tk.Tk):
                     self.after_cancel(self._countdown_id)
                     self.start_clipboard_countdown()
 
+                self.app_config['SETTINGS']['auto_sync_minutes'] = str(new_auto_sync_minutes)
+                self.schedule_auto_sync()
+                self.app_config['SETTINGS']['item_cache_mb'] = str(new_item_cache_mb)
+                self.apply_item_cache_budget()
+                self.app_config['SETTINGS']['ingest_worker_enabled'] = 'true' if ingest_worker_var.get() else 'false'
+
+                query_socket_enabled = query_socket_var.get()
+                self.app_config['SETTINGS']['query_socket_enabled'] = 'true' if query_socket_enabled else 'false'
+                if query_socket_enabled:
+                    self.start_query_server()
+                else:
+                    self.stop_query_server()
+
                 with open(self.CONFIG_FILE, 'w') as f:
                     self.app_config.write(f)
 
@@ -877,7 +3182,7 @@ class App(tk.Tk):
                 settings_window.destroy()
 
             except ValueError:
-                messagebox.showerror("Invalid Input", "Clipboard clear delay must be a whole number.")
+                messagebox.showerror("Invalid Input", "Clipboard clear delay, auto-sync interval and cache budget must be whole numbers.")
             except Exception as e:
                 logging.error(f"Error saving settings: {e}")
                 messagebox.showerror("Error", f"Failed to save settings: {e}")
@@ -886,7 +3191,8 @@ class App(tk.Tk):
             response = messagebox.askyesno("Confirm Clear", "Are you sure you want to clear all search history?")
             if response:
                 self.SEARCH_HISTORY = []
-                self.app_config['SETTINGS']['search_history'] = json.dumps(self.SEARCH_HISTORY)
+                self.active_profile.search_history = self.SEARCH_HISTORY
+                self.app_config[self.active_profile.config_section]['search_history'] = json.dumps(self.SEARCH_HISTORY)
 
                 if hasattr(self, 'entry_site_name') and self.entry_site_name.winfo_exists():
                     self.entry_site_name['values'] = []
@@ -901,7 +3207,7 @@ class App(tk.Tk):
         btn_clear_history.config(command=perform_clear_search_history)
 
         button_frame = ttk.Frame(content_frame, style='DarkAccent.TFrame')
-        button_frame.grid(row=2, column=0, columnspan=2, pady=15)
+        button_frame.grid(row=6, column=0, columnspan=2, pady=15)
 
         btn_save = ttk.Button(button_frame, text="Save", command=save_and_apply_settings)
         btn_save.pack(side=tk.LEFT, padx=5)
@@ -925,9 +3231,18 @@ class App(tk.Tk):
         except Exception as e:
             logging.error(f"Error saving window geometry: {e}")
 
+        self.stop_query_server()
+        for profile in self.profiles.values():
+            profile.sync_manager.stop()
+            profile.item_store.close()
+        self.details_prefetcher.shutdown()
+        self.ingest_worker.close()
+        if self._export_cancel_event:
+            self._export_cancel_event.set()
         self.destroy()
         sys.exit()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # The ingestion worker is a spawned copy of this program, also in frozen builds
     app = App()
     app.mainloop()
\ No newline at end of file